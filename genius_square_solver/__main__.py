@@ -5,7 +5,6 @@ This is the main code file for the Genius Square Solver.
 import typing as t
 from dice import letter_coord_to_index
 from board import Board
-from image_processor import ImageReader
 
 
 def main() -> None:
@@ -15,6 +14,9 @@ def main() -> None:
     :return: None
     """
 
+    # imported here, so the solver can be used without loading OpenCV
+    from image_processor import ImageReader  # pylint: disable=C0415
+
     # Read the image
     print("Reading image...")
     path = '../res/test2.jpg'
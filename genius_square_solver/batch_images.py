@@ -0,0 +1,162 @@
+"""
+This is the code file for reading and solving many board photos for the Genius Square Solver
+project.
+
+It reads the blockers from each photo and solves the board across a worker pool, writing one JSON
+line per photo as soon as it is done, eg:
+    python batch_images.py photos/ --output results.jsonl
+    find photos -name '*.jpg' | python batch_images.py - --processes 8
+Photos that can't be read or solved are written with an error instead of stopping the batch.
+"""
+
+# pylint: disable=E1101,R0913,R0917
+
+import argparse
+import glob
+import json
+import os
+import sys
+import typing as t
+from contextlib import nullcontext
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+from time import perf_counter
+
+import cv2
+
+from board import Board
+from dice import letter_coord_to_index
+from image_processor import DEFAULT_TARGET_SIZE, ImageReader
+
+# The file extensions of the images to read from a directory.
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+
+def find_images(sources: t.List[str]) -> t.Iterator[str]:
+    """
+    Find the image paths to read.
+
+    :param sources: Image paths, directories to read every image in, glob patterns, or '-' to
+     read paths from stdin, one per line.
+    :return: An iterator of image paths.
+    """
+
+    for source in sources:
+        if source == '-':
+            for line in sys.stdin:
+                if line.strip():
+                    yield line.strip()
+        elif os.path.isdir(source):
+            for name in sorted(os.listdir(source)):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    yield os.path.join(source, name)
+        elif glob.has_magic(source):
+            yield from sorted(glob.glob(source, recursive=True))
+        else:
+            yield source
+
+
+def _init_worker() -> None:
+    """
+    Set up a worker, so OpenCV doesn't start its own threads in every worker.
+
+    :return: None
+    """
+
+    cv2.setNumThreads(1)
+
+
+def read_and_solve(job: tuple[str, t.Optional[int], int]) -> str:
+    """
+    Read the blockers from a photo and solve the board.
+
+    :param job: The (path, target size, reduction) of the photo to read.
+    :return: The result as a JSON line, with the path, blockers, solution, the seconds each stage
+     took, and the error if it failed. The solution is a list of rows of piece UUIDs, or None.
+    """
+
+    path, target_size, reduction = job
+    result: t.Dict[str, t.Any] = {'path': path, 'blockers': None, 'solution': None,
+                                  'timings': {}, 'error': None}
+
+    reader = ImageReader(path, target_size, reduction)
+    try:
+        reader.process()
+        result['timings'].update(reader.get_timings())
+        blockers = reader.get_marker_names()
+        result['blockers'] = blockers
+
+        start_time = perf_counter()
+        board = Board([letter_coord_to_index(name) for name in blockers], limit=1)
+        if board.solve():
+            result['solution'] = board.get_space().tolist()
+        result['timings']['solve'] = perf_counter() - start_time
+    except Exception as error:  # pylint: disable=W0718
+        result['timings'].update(reader.get_timings())
+        result['error'] = f"{type(error).__name__}: {error}"
+
+    return json.dumps(result)
+
+
+def batch_read(paths: t.Iterable[str], output: t.TextIO, processes: t.Optional[int] = None,
+               threads: bool = False, target_size: t.Optional[int] = DEFAULT_TARGET_SIZE,
+               reduction: int = 1) -> int:
+    """
+    Read and solve a batch of photos across a worker pool, writing each result as it finishes.
+
+    :param paths: The paths of the photos.
+    :param output: The file to write one JSON line per photo to.
+    :param processes: The number of workers, or None for one per CPU.
+    :param threads: Whether to use threads instead of processes. OpenCV releases the GIL while it
+     decodes and detects, but solving doesn't.
+    :param target_size: The target size to pass to ImageReader.
+    :param reduction: The reduction to decode photos at, to pass to ImageReader.
+    :return: The number of photos that failed.
+    """
+
+    failures = 0
+    pool_class = ThreadPool if threads else Pool
+    with pool_class(processes, initializer=_init_worker) as pool:
+        jobs = ((path, target_size, reduction) for path in paths)
+        for line in pool.imap_unordered(read_and_solve, jobs):
+            output.write(line + '\n')
+            output.flush()
+            failures += json.loads(line)['error'] is not None
+    return failures
+
+
+def main() -> None:
+    """
+    The main function to read and solve a batch of photos.
+
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description="Read and solve Genius Square board photos.")
+    parser.add_argument('sources', nargs='+',
+                        help="image paths, directories, glob patterns, or - to read paths from "
+                             "stdin")
+    parser.add_argument('--output', default='-', help="the file to write results to")
+    parser.add_argument('--processes', type=int, help="the number of workers")
+    parser.add_argument('--threads', action='store_true',
+                        help="use a thread pool instead of a process pool")
+    parser.add_argument('--target-size', type=int, default=DEFAULT_TARGET_SIZE,
+                        help="the size to shrink photos to before finding circles, or 0 for none")
+    parser.add_argument('--reduction', type=int, default=1, choices=[1, 2, 4, 8],
+                        help="decode photos in grayscale at 1/2, 1/4 or 1/8 of their size")
+    args = parser.parse_args()
+    if args.reduction != 1 and not args.target_size:
+        parser.error("--reduction needs a --target-size")
+
+    # stdout is wrapped so the with block doesn't close it
+    with nullcontext(sys.stdout) if args.output == '-' \
+            else open(args.output, 'w', encoding='utf-8') as output:
+        failures = batch_read(find_images(args.sources), output, args.processes, args.threads,
+                              args.target_size or None, args.reduction)
+
+    if failures:
+        print(f"{failures} photos failed", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""
+This is the code file for benchmarking the solver for the Genius Square Solver project.
+
+It solves a fixed set of DiceCombo seeds with each configuration, and reports latency percentiles,
+solutions per second, nodes per second and peak memory. Results are written as JSON, and can be
+compared against a saved baseline to flag slowdowns, eg:
+    python benchmark.py --output baseline.json
+    python benchmark.py --baseline baseline.json
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+import typing as t
+from time import time_ns
+
+from board import Board
+from dead_states import get_dead_state_cache
+from dice_combinations import DiceCombo
+from piece import PIECES
+from placements import get_placement_table
+
+# The number of distinct dice outcomes, which is the range of DiceCombo seeds.
+SEED_RANGE = 6 ** 7
+
+# The Board arguments of each configuration.
+CONFIGURATIONS: t.Dict[str, t.Dict[str, t.Any]] = {
+    'bitboard': {'engine': 'bitboard'},
+    'dlx': {'engine': 'dlx'},
+    'numpy': {'engine': 'numpy'},
+    'parallel': {'engine': 'parallel'},
+}
+
+# The latencies checked against the baseline.
+COMPARED_LATENCIES = ['p50', 'p95', 'p99', 'max']
+
+
+def get_seeds(count: int) -> t.List[int]:
+    """
+    Get a fixed set of seeds spread evenly over every dice outcome.
+
+    :param count: The number of seeds.
+    :return: The seeds.
+    """
+
+    return list(range(0, SEED_RANGE, SEED_RANGE // count))[:count]
+
+
+def percentile(values: t.List[float], fraction: float) -> float:
+    """
+    Get a percentile of some values, by the nearest rank.
+
+    :param values: The values, sorted.
+    :param fraction: The percentile as a fraction, eg 0.95.
+    :return: The percentile.
+    """
+
+    rank = max(0, min(len(values) - 1, round(fraction * len(values)) - 1))
+    return values[rank]
+
+
+def run_configuration(name: str, seeds: t.List[int], limit: t.Optional[int],
+                      time_limit: float) -> t.Dict[str, t.Any]:
+    """
+    Benchmark one configuration over a set of seeds. The seeds are solved once for timing, counting
+    the nodes each search expands, then again with tracemalloc to find the peak memory, as tracing
+    slows the search. The dead state cache is cleared before each pass, so both passes search the
+    same nodes.
+
+    :param name: The name of the configuration in CONFIGURATIONS.
+    :param seeds: The seeds to solve.
+    :param limit: The solution limit to solve with.
+    :param time_limit: The time limit of each board.
+    :return: The results of the configuration.
+    """
+
+    options = CONFIGURATIONS[name]
+    dead_states = get_dead_state_cache(get_placement_table(PIECES[1:]))
+
+    latencies = []
+    solutions = 0
+    nodes = 0
+    dead_states.clear()
+    for seed in seeds:
+        board = Board(DiceCombo.get_blockers(seed), limit=limit, time_limit=time_limit,
+                      use_database=False, **options)
+        start_time = time_ns()
+        board.solve()
+        end_time = time_ns()
+
+        latencies.append((end_time - start_time) / 1_000_000_000)
+        solutions += board.get_solution_count()
+        nodes += board.get_node_count()
+
+    peak_memory = 0
+    dead_states.clear()
+    tracemalloc.start()
+    for seed in seeds:
+        tracemalloc.reset_peak()
+        Board(DiceCombo.get_blockers(seed), limit=limit, time_limit=time_limit,
+              use_database=False, **options).solve()
+        peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    total_time = sum(latencies)
+    latencies.sort()
+    return {
+        'options': options,
+        'boards': len(seeds),
+        'total_time': total_time,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'max': latencies[-1],
+        'solutions_per_second': solutions / total_time if total_time else 0.0,
+        'nodes_per_second': nodes / total_time if total_time else 0.0,
+        'peak_memory': peak_memory,
+    }
+
+
+def compare(results: t.Dict[str, t.Any], baseline: t.Dict[str, t.Any],
+            tolerance: float) -> t.List[str]:
+    """
+    Compare benchmark results against a baseline.
+
+    :param results: The results of this run.
+    :param baseline: The results of a saved run.
+    :param tolerance: The fraction a latency can grow by before it is flagged, eg 0.1 for 10%.
+    :return: A description of each latency that got slower than the tolerance.
+    """
+
+    if results['seeds'] != baseline['seeds'] or results['limit'] != baseline['limit']:
+        raise ValueError("The baseline was run on different seeds or with a different limit")
+
+    slowdowns = []
+    for name, result in results['configurations'].items():
+        if name not in baseline['configurations']:
+            continue
+        for latency in COMPARED_LATENCIES:
+            old = baseline['configurations'][name][latency]
+            new = result[latency]
+            if new > old * (1 + tolerance):
+                slowdowns.append(f"{name} {latency}: {old * 1000:.2f}ms -> {new * 1000:.2f}ms "
+                                 f"({(new / old - 1) * 100:+.0f}%)")
+    return slowdowns
+
+
+def main() -> None:
+    """
+    The main function to run the benchmark.
+
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark the Genius Square solver.")
+    parser.add_argument('--configurations', nargs='+', default=['bitboard', 'dlx'],
+                        choices=list(CONFIGURATIONS), help="the configurations to benchmark")
+    parser.add_argument('--seeds', type=int, default=200, help="the number of seeds to solve")
+    parser.add_argument('--limit', type=int, default=1,
+                        help="the number of solutions to find, or 0 for every solution")
+    parser.add_argument('--time-limit', type=float, default=600,
+                        help="the time limit of each board in seconds")
+    parser.add_argument('--output', help="the file to write the JSON results to")
+    parser.add_argument('--baseline', help="a JSON results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="the fraction a latency can grow by before it is flagged")
+    args = parser.parse_args()
+
+    seeds = get_seeds(args.seeds)
+    limit = args.limit or None
+    results = {'seeds': seeds, 'limit': limit, 'configurations': {}}
+    for name in args.configurations:
+        result = run_configuration(name, seeds, limit, args.time_limit)
+        results['configurations'][name] = result
+        print(f"{name}: p50 {result['p50'] * 1000:.2f}ms, p95 {result['p95'] * 1000:.2f}ms, "
+              f"p99 {result['p99'] * 1000:.2f}ms, max {result['max'] * 1000:.2f}ms, "
+              f"{result['solutions_per_second']:.0f} solutions/s, "
+              f"{result['nodes_per_second']:.0f} nodes/s, "
+              f"peak memory {result['peak_memory'] / 1024:.0f}KiB")
+
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            slowdowns = compare(results, json.load(file), args.tolerance)
+        for slowdown in slowdowns:
+            print(f"Slower than baseline: {slowdown}")
+        if slowdowns:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,554 @@
+"""
+This module contains the bitboard solver engine.
+
+The board is stored as a 36-bit integer, where bit (row * 6 + col) is set if that square is
+covered. Every placement of a piece is precomputed as a bitmask, so checking a fit is a single
+``&`` and placing a piece is a single ``|``.
+"""
+
+# pylint: disable=R0902,R0912,R0913,R0917
+
+import typing as t
+from dead_states import DeadStateCache, get_dead_state_cache
+from placements import BOARD_SIZE, Placement, PlacementTable, cell_bit
+from search_limit import DEFAULT_CHECK_INTERVAL, CancelToken, SearchLimit
+from search_stats import SearchStats
+
+FULL_BOARD = (1 << (BOARD_SIZE * BOARD_SIZE)) - 1
+
+# Masks to stop squares wrapping onto the next row when a bitmask is shifted a column.
+_FIRST_COLUMN = sum(cell_bit(row, 0) for row in range(BOARD_SIZE))
+_NOT_FIRST_COLUMN = FULL_BOARD & ~_FIRST_COLUMN
+_NOT_LAST_COLUMN = FULL_BOARD & ~(_FIRST_COLUMN << (BOARD_SIZE - 1))
+
+# The largest empty region whose shape is checked when pruning regions.
+SMALL_REGION = 4
+
+
+class SearchState(t.NamedTuple):
+    """
+    A point part way through the search, which can be resumed on its own.
+    """
+
+    occupied: int  # bitmask of covered squares
+    remaining: int  # bitmask of the indexes of the pieces still to place
+    placed: t.List[Placement]  # the placements made so far
+
+
+def blockers_to_mask(blockers: t.List[t.Any]) -> int:
+    """
+    Convert a list of blocker positions into a board bitmask.
+
+    :param blockers: A list of (row, col) blocker positions.
+    :return: The bitmask with every blocker square set.
+    """
+
+    mask = 0
+    for row, col in blockers:
+        mask |= cell_bit(row, col)
+    return mask
+
+
+def neighbours(mask: int) -> int:
+    """
+    Get the squares next to the squares of a bitmask (not diagonally).
+
+    :param mask: The bitmask of squares.
+    :return: The bitmask of their neighbouring squares, which may include squares in the mask.
+    """
+
+    return (((mask << 1) & _NOT_FIRST_COLUMN) | ((mask >> 1) & _NOT_LAST_COLUMN)
+            | ((mask << BOARD_SIZE) & FULL_BOARD) | (mask >> BOARD_SIZE))
+
+
+def flood_fill(seed: int, empty: int) -> int:
+    """
+    Find the connected region of empty squares that contains a square.
+
+    :param seed: The bit of the square to start from.
+    :param empty: The bitmask of empty squares.
+    :return: The bitmask of the region.
+    """
+
+    region = seed
+    while True:
+        grown = (region | neighbours(region)) & empty
+        if grown == region:
+            return region
+        region = grown
+
+
+def get_single_pieces(table: PlacementTable) -> int:
+    """
+    Get the pieces that cover a single square, which are the only pieces that can fill an
+    enclosed single empty square.
+
+    :param table: The placement table of the pieces.
+    :return: The bitmask of the indexes of the pieces.
+    """
+
+    return sum(1 << piece_index for piece_index in range(len(table.get_pieces()))
+               if table.get_placements(piece_index)[0].bits.bit_count() == 1)
+
+
+_area_sums: t.Dict[PlacementTable, t.List[int]] = {}
+
+
+def get_area_sums(table: PlacementTable) -> t.List[int]:
+    """
+    Get the subset sums of the piece areas used to prune regions, building them only the first
+    time they are asked for.
+
+    :param table: The placement table of the pieces.
+    :return: For each bitmask of piece indexes, a bitmask with bit n set if a subset of the pieces
+     covers n squares.
+    """
+
+    if table not in _area_sums:
+        piece_count = len(table.get_pieces())
+        areas = [table.get_placements(piece_index)[0].bits.bit_count()
+                 for piece_index in range(piece_count)]
+        area_sums = []
+        for pieces in range(1 << piece_count):
+            sums = 1
+            for piece_index, area in enumerate(areas):
+                if pieces >> piece_index & 1:
+                    sums |= sums << area
+            area_sums.append(sums)
+        _area_sums[table] = area_sums
+    return _area_sums[table]
+
+
+class BitboardSolver:
+    """
+    This class solves a board using bitmasks instead of numpy slices.
+
+    Each step fills the lowest empty square, trying only the placements of the remaining pieces
+    that cover it, as listed by the placement table.
+
+    After each placement, the search can be pruned if it has left empty regions that the remaining
+    pieces can't fill:
+    - 'holes' checks for single empty squares with no empty neighbours, which only a single square
+      piece (Blue) can fill. This only takes a few bit operations.
+    - 'regions' also flood fills the empty regions next to the placement, and checks that the
+      remaining pieces have a subset that adds up to each region's size, and that small regions
+      are a shape the remaining pieces can fill. This visits fewer nodes, but in Python the flood
+      fill costs more time than it saves, so it is not the default.
+
+    States whose subtree was fully searched without finding a solution are remembered in a dead
+    state cache, so reaching them again by another placement order skips straight past them.
+
+    To see why a board is slow, pass a SearchStats to collect counts of the search, or an on_node
+    callback that is called with (occupied, remaining, depth) at every node. Without them, the
+    search only checks a flag at each node.
+
+    The search stops early when it reaches the time limit or max_nodes nodes, or when the cancel
+    token is cancelled. These are only checked every check_interval nodes, and get_status says
+    which of them stopped the last search.
+    """
+
+    prune_levels = ['none', 'holes', 'regions']
+
+    def __init__(self, table: PlacementTable, blockers: t.List[t.Any],
+                 time_limit: float = 20, prune: str = 'holes',
+                 dead_states: t.Union[DeadStateCache, bool] = True,
+                 stats: t.Optional[SearchStats] = None,
+                 on_node: t.Optional[t.Callable[[int, int, int], None]] = None,
+                 max_nodes: t.Optional[int] = None, cancel: t.Optional[CancelToken] = None,
+                 check_interval: int = DEFAULT_CHECK_INTERVAL) -> None:
+        """
+        Constructor to set up the solver.
+
+        :param table: The placement table of the pieces to place.
+        :param blockers: A list of the blocker positions to use.
+        :param time_limit: The maximum number of seconds to search for.
+        :param prune: How to prune the search, one of BitboardSolver.prune_levels.
+        :param dead_states: The dead state cache to use, True to share the placement table's
+         cache with other solvers, or False to not use one.
+        :param stats: The stats to add the counts of the search to, or None.
+        :param on_node: A function called with (occupied, remaining, depth) at every node, or None.
+        :param max_nodes: The maximum number of nodes to expand in a search, or None for no limit.
+        :param cancel: A token to cancel the search with from another thread, or None.
+        :param check_interval: The number of nodes between checks of the time and cancel token.
+        :return: None
+        """
+
+        # error checking
+        if prune not in BitboardSolver.prune_levels:
+            raise ValueError(f"Prune must be one of: {', '.join(BitboardSolver.prune_levels)}")
+
+        self.__table = table
+        self.__blocked = blockers_to_mask(blockers)
+        self.__limit = SearchLimit(time_limit, max_nodes, cancel, check_interval)
+        self.__piece_count = len(table.get_pieces())
+        self.__prune = prune
+        self.__pruned = 0
+        self.__found = 0
+        self.__stats = stats
+        self.__on_node = on_node
+        self.__tracing = stats is not None or on_node is not None
+
+        self.__dead_states: t.Optional[DeadStateCache] = None
+        if dead_states is True:
+            self.__dead_states = get_dead_state_cache(table)
+        elif dead_states is not False:
+            self.__dead_states = dead_states
+
+        # The subset sums are only used to prune regions, so they aren't built for other levels
+        self.__single_pieces = get_single_pieces(table)
+        self.__area_sums = get_area_sums(table) if prune == 'regions' else []
+
+    def get_pruned_count(self) -> int:
+        """
+        Get the number of placements pruned since the solver was created.
+
+        :return: The number of pruned placements.
+        """
+
+        return self.__pruned
+
+    def get_dead_states(self) -> t.Optional[DeadStateCache]:
+        """
+        Get the dead state cache the solver uses, to read its hit rate.
+
+        :return: The dead state cache, or None if the solver doesn't use one.
+        """
+
+        return self.__dead_states
+
+    def get_status(self) -> str:
+        """
+        Get whether the last search finished or what stopped it.
+
+        :return: The status, one of the statuses in search_limit.
+        """
+
+        return self.__limit.get_status()
+
+    def get_node_count(self) -> int:
+        """
+        Get the number of nodes expanded in the last search.
+
+        :return: The number of nodes.
+        """
+
+        return self.__limit.get_nodes()
+
+    def __start(self) -> None:
+        """
+        Start a search, resetting the node count and limits.
+
+        :return: None
+        """
+
+        self.__limit.start()
+
+    def solve(self, limit: t.Optional[int]) -> t.List[t.List[Placement]]:
+        """
+        Solve the board.
+
+        :param limit: The maximum number of solutions to find, or None to find every solution.
+        :return: A list of solutions, each a list of placements.
+        """
+
+        solutions = []
+        for solution in self.iter_solutions():
+            solutions.append(solution)
+            if limit is not None and len(solutions) >= limit:
+                break
+        return solutions
+
+    def iter_solutions(self, state: t.Optional[SearchState] = None
+                       ) -> t.Iterator[t.List[Placement]]:
+        """
+        Lazily find the solutions of the board, yielding each one as soon as it is found. The
+        time limit counts from when this is called.
+
+        :param state: The state to search from, from split(). The whole board is searched if None.
+        :return: An iterator of solutions, each a list of placements.
+        """
+
+        self.__start()
+        if state is None:
+            state = self.__get_start_state()
+        if state.occupied == FULL_BOARD:
+            return iter([list(state.placed)])
+        if self.__stats is not None:
+            return self.__timed_search(state)
+        return self.__search(state.occupied, state.remaining, list(state.placed))
+
+    def __timed_search(self, state: SearchState) -> t.Iterator[t.List[Placement]]:
+        """
+        Search from a state, timing it in the stats until the search ends or the caller stops.
+
+        :param state: The state to search from.
+        :return: An iterator of solutions.
+        """
+
+        self.__stats.start(self.__piece_count)
+        try:
+            yield from self.__search(state.occupied, state.remaining, list(state.placed))
+        finally:
+            self.__stats.stop()
+
+    def split(self, depth: int) -> t.List[SearchState]:
+        """
+        Split the search into independent parts by making every possible combination of the first
+        placements. Searching every part with iter_solutions finds every solution once.
+
+        :param depth: The number of placements to make.
+        :return: The states to search from.
+        """
+
+        states = [self.__get_start_state()]
+        for _ in range(depth):
+            next_states = []
+            for occupied, remaining, placed in states:
+                if occupied == FULL_BOARD:
+                    next_states.append(SearchState(occupied, remaining, placed))
+                    continue
+
+                empty = FULL_BOARD & ~occupied
+                target = (empty & -empty).bit_length() - 1
+                for piece_index in range(self.__piece_count):
+                    if not remaining >> piece_index & 1:
+                        continue
+                    for placement in self.__table.get_covering(piece_index, target):
+                        if not occupied & placement.bits:
+                            next_states.append(SearchState(occupied | placement.bits,
+                                                           remaining & ~(1 << piece_index),
+                                                           placed + [placement]))
+            states = next_states
+        return states
+
+    def __get_start_state(self) -> SearchState:
+        """
+        Get the state at the start of the search, with only the blockers placed.
+
+        :return: The start state.
+        """
+
+        return SearchState(self.__blocked, (1 << self.__piece_count) - 1, [])
+
+    def count(self) -> int:
+        """
+        Count every solution of the board, without building the solutions.
+
+        :return: The number of solutions.
+        :raises TimeoutError: If the search is stopped by a limit before every solution is
+         counted.
+        """
+
+        self.__start()
+        if self.__stats is not None:
+            self.__stats.start(self.__piece_count)
+        count = self.__count(self.__blocked, (1 << self.__piece_count) - 1, {})
+        if self.__stats is not None:
+            self.__stats.stop()
+
+        if self.__limit.is_stopped():
+            raise TimeoutError(f"Counting solutions stopped early: {self.__limit.get_status()}")
+        return count
+
+    def __count(self, occupied: int, remaining: int, counts: t.Dict[tuple[int, int], int]) -> int:
+        """
+        Recursive function to count the solutions for the current search state. This is the same
+        search as __search, without keeping track of the placements. Different placement orders
+        often reach the same state, so the counts are remembered for each state.
+
+        :param occupied: The bitmask of covered squares.
+        :param remaining: The bitmask of the indexes of the pieces still to place.
+        :param counts: The counts already found, keyed by (occupied, remaining).
+        :return: The number of solutions.
+        """
+
+        if (occupied, remaining) in counts:
+            if self.__stats is not None:
+                self.__stats.add_cache_hit()
+            return counts[occupied, remaining]
+
+        if self.__limit.count_node():
+            return 0
+
+        empty = FULL_BOARD & ~occupied
+        target = (empty & -empty).bit_length() - 1
+        tracing = self.__tracing
+        if tracing:
+            self.__trace_node(occupied, remaining)
+
+        count = 0
+        for piece_index in range(self.__piece_count):
+            if not remaining >> piece_index & 1:
+                continue
+
+            new_remaining = remaining & ~(1 << piece_index)
+            covering = self.__table.get_covering(piece_index, target)
+            if tracing:
+                covering = self.__trace_placements(occupied, covering)
+            for placement in covering:
+                if occupied & placement.bits:
+                    continue
+
+                if occupied | placement.bits == FULL_BOARD:
+                    count += 1
+                elif new_remaining and not self.__is_dead(occupied | placement.bits,
+                                                          new_remaining, placement.bits):
+                    count += self.__count(occupied | placement.bits, new_remaining, counts)
+
+        if self.__stats is not None and count == 0:
+            self.__stats.add_backtrack()
+
+        counts[occupied, remaining] = count
+        return count
+
+    def __search(self, occupied: int, remaining: int,
+                 placed: t.List[Placement]) -> t.Iterator[t.List[Placement]]:
+        """
+        Recursive generator that yields solutions for the current search state.
+
+        :param occupied: The bitmask of covered squares.
+        :param remaining: The bitmask of the indexes of the pieces still to place.
+        :param placed: The placements made so far.
+        :return: An iterator of solutions.
+        """
+
+        # Every so many nodes, check whether a limit has been reached and stop searching if so
+        if self.__limit.count_node():
+            return
+
+        dead_states = self.__dead_states
+        if dead_states is not None:
+            key = DeadStateCache.get_key(occupied, remaining)
+            if dead_states.is_dead(key):
+                if self.__stats is not None:
+                    self.__stats.add_cache_hit()
+                return
+        found = self.__found
+
+        # Every square below the lowest empty one is covered, so any placement that covers it and
+        # doesn't overlap the covered squares is legal.
+        empty = FULL_BOARD & ~occupied
+        target = (empty & -empty).bit_length() - 1
+        tracing = self.__tracing
+        if tracing:
+            self.__trace_node(occupied, remaining)
+
+        for piece_index in range(self.__piece_count):
+            if not remaining >> piece_index & 1:
+                continue
+
+            covering = self.__table.get_covering(piece_index, target)
+            if tracing:
+                covering = self.__trace_placements(occupied, covering)
+            for placement in covering:
+                if occupied & placement.bits:
+                    continue
+
+                new_occupied = occupied | placement.bits
+                placed.append(placement)
+
+                new_remaining = remaining & ~(1 << piece_index)
+                if new_occupied == FULL_BOARD:
+                    self.__found += 1
+                    yield list(placed)
+                elif new_remaining and not self.__is_dead(new_occupied, new_remaining,
+                                                          placement.bits):
+                    yield from self.__search(new_occupied, new_remaining, placed)
+
+                placed.pop()
+
+        # Only a subtree that was searched to the end without a solution is known to be dead
+        if self.__found == found and not self.__limit.is_stopped():
+            if dead_states is not None:
+                dead_states.add(key)
+            if self.__stats is not None:
+                self.__stats.add_backtrack()
+
+    def __trace_node(self, occupied: int, remaining: int) -> None:
+        """
+        Add a node of the search to the stats and call the on_node callback.
+
+        :param occupied: The bitmask of covered squares.
+        :param remaining: The bitmask of the indexes of the pieces still to place.
+        :return: None
+        """
+
+        depth = self.__piece_count - remaining.bit_count()
+        if self.__on_node is not None:
+            self.__on_node(occupied, remaining, depth)
+        if self.__stats is not None:
+            self.__stats.add_node(depth)
+
+    def __trace_placements(self, occupied: int,
+                           covering: t.Sequence[Placement]) -> t.Iterator[Placement]:
+        """
+        Yield the placements covering a square, adding each one the search reaches to the stats,
+        as a fit test and, if it fits, as a placement tried.
+
+        :param occupied: The bitmask of covered squares.
+        :param covering: The placements of a piece covering the square being filled.
+        :return: An iterator over the placements.
+        """
+
+        for placement in covering:
+            if self.__stats is not None:
+                self.__stats.add_fit_test()
+                if not occupied & placement.bits:
+                    self.__stats.add_placement(placement.piece)
+            yield placement
+
+    def __is_dead(self, occupied: int, remaining: int, bits: int) -> bool:
+        """
+        Check whether a placement has left empty regions that the remaining pieces can't fill.
+
+        :param occupied: The bitmask of covered squares, including the placement.
+        :param remaining: The bitmask of the indexes of the pieces still to place.
+        :param bits: The bitmask of the placement.
+        :return: True if the search can be pruned here.
+        """
+
+        if self.__prune == 'none':
+            return False
+
+        # A square with no empty neighbours can only be filled by a single square piece.
+        empty = FULL_BOARD & ~occupied
+        holes = empty & ~neighbours(empty)
+        dead = bool(holes) and holes.bit_count() > (remaining & self.__single_pieces).bit_count()
+
+        if self.__prune == 'regions' and not dead:
+            # Any region that was cut off by the placement must be next to it.
+            seeds = neighbours(bits) & empty & ~holes
+            while seeds and not dead:
+                region = flood_fill(seeds & -seeds, empty)
+                seeds &= ~region
+                size = region.bit_count()
+                dead = not self.__area_sums[remaining] >> size & 1 or \
+                    (size <= SMALL_REGION and not self.__can_fill(region, remaining))
+
+        if dead:
+            self.__pruned += 1
+            if self.__stats is not None:
+                self.__stats.add_prune()
+        return dead
+
+    def __can_fill(self, region: int, remaining: int) -> bool:
+        """
+        Check whether some of the remaining pieces can exactly fill a region.
+
+        :param region: The bitmask of the region.
+        :param remaining: The bitmask of the indexes of the pieces that can be used.
+        :return: True if the region can be filled.
+        """
+
+        if not region:
+            return True
+
+        target = (region & -region).bit_length() - 1
+        for piece_index in range(self.__piece_count):
+            if not remaining >> piece_index & 1:
+                continue
+            for placement in self.__table.get_covering(piece_index, target):
+                if not placement.bits & ~region and \
+                        self.__can_fill(region & ~placement.bits, remaining & ~(1 << piece_index)):
+                    return True
+        return False
@@ -2,57 +2,115 @@
 This module contains the board class.
 """
 
+# pylint: disable=R0902,R0913,R0917
+
 import typing as t
-from copy import deepcopy
-from time import time
 import numpy as np
-from piece import Piece
+from piece import PIECES, Piece
+from bitboard import BitboardSolver
+from dlx import DLXSolver
+from placements import BOARD_SIZE, get_placement_table
+from search_limit import FINISHED, CancelToken, SearchLimit
+from search_stats import SearchStats
+from solution_cache import SolutionCache, get_solution_cache
+from solution_db import get_default_database
 from colorama import Fore, Style
 
 
 class Board:
     """
-    This board class represents the game board.
+    This board class represents the game board. The pieces are shared with every other board,
+    and solutions are stored packed together as one int8 piece UUID per square, so a board with
+    many solutions stays small.
     """
 
-    def __init__(self, blockers: t.List[t.Any], limit: int = 10, time_limit:int=20) -> None:
+    __slots__ = ('__blockers', '__solutions', '__limit', '__time_limit', '__engine',
+                 '__use_database', '__processes', '__stats', '__max_nodes', '__cancel',
+                 '__search_limit', '__status_source', '__space')
+
+    engines = ['bitboard', 'dlx', 'numpy', 'parallel']
+
+    def __init__(self, blockers: t.List[t.Any], limit: t.Optional[int] = 10, time_limit:int=20,
+                 engine: str = 'bitboard', use_database: bool = True,
+                 processes: t.Optional[int] = None,
+                 stats: t.Optional[SearchStats] = None, max_nodes: t.Optional[int] = None,
+                 cancel: t.Optional[CancelToken] = None) -> None:
         """
         Constructor to set up the board.
 
         :param blockers: A list of the blocker positions to use.
-        :param limit: The maximum number of solutions to find.
+        :param limit: The maximum number of solutions to find, or None to find every solution.
+        :param time_limit: The maximum number of seconds to search for.
+        :param engine: The solver engine to use, one of Board.engines.
+        :param use_database: Whether to answer from the solution database when it has been built,
+         or from the solution cache when a board with symmetric blockers was already solved.
+        :param processes: The number of worker processes for the parallel engine, or None for one
+         per CPU.
+        :param stats: The stats to add the counts of the bitboard engine's searches to, or None.
+         Answers from the solution database or cache aren't searched, so they aren't counted.
+        :param max_nodes: The maximum number of nodes to expand in a search, or None for no limit.
+         The parallel engine doesn't use this.
+        :param cancel: A token to cancel the search with from another thread, or None.
         :return: None
         """
 
-        self.__start_solve = 0
+        # error checking
+        if engine not in Board.engines:
+            raise ValueError(f"Engine must be one of: {', '.join(Board.engines)}")
+
         self.__blockers = blockers
-        self.__pieces = self.__create_pieces()
-        self.__solutions: list[Board] = []
+        self.__solutions = bytearray()
         self.__limit = limit
         self.__time_limit = time_limit
+        self.__engine = engine
+        self.__use_database = use_database
+        self.__processes = processes
+        self.__stats = stats
+        self.__max_nodes = max_nodes
+        self.__cancel = cancel
 
-        self.__space = np.zeros((6, 6), np.int8)
+        # The limits of the numpy engine's search, and what to read the status of the last search
+        # from, which is None if there hasn't been one.
+        self.__search_limit = SearchLimit(time_limit, max_nodes, cancel)
+        self.__status_source: t.Optional[t.Any] = None
 
-        for blocker in self.__blockers:
-            self.place_piece(blocker[0], blocker[1], self.__pieces[0], 0)
+        self.__space = self.__create_space()
+
+    def get_solution_limit(self) -> t.Optional[int]:
+        """
+        Get the solution limit for the solver.
 
-    def get_out_of_time(self) -> bool:
+        :return: The solution limit for the solver, or None if there is no limit.
         """
-        Get whether the solver has run out of time or not
 
-        :return: The time limit for the solver.
+        return self.__limit
+
+    def get_status(self) -> str:
         """
+        Get whether the last search finished, or whether it timed out, ran out of nodes or was
+        cancelled. The solutions found before it was stopped are kept.
 
-        return time() - self.__start_solve > self.__time_limit
+        :return: The status, one of the statuses in search_limit.
+        """
 
-    def get_solution_limit(self) -> int:
+        if self.__status_source is None:
+            return FINISHED
+        return self.__status_source.get_status()
+
+    def get_node_count(self) -> int:
         """
-        Get the solution limit for the solver.
+        Get the number of nodes the last search expanded. The parallel engine only counts the
+        parts that finished.
 
-        :return: The solution limit for the solver.
+        :return: The number of nodes, or 0 if there hasn't been a search, eg because the answer
+         came from the solution database or cache.
         """
 
-        return self.__limit
+        if self.__status_source is None:
+            return 0
+        if isinstance(self.__status_source, SearchLimit):
+            return self.__status_source.get_nodes()
+        return self.__status_source.get_node_count()
 
     def add_solution(self, board: t.Self) -> None:
         """
@@ -62,40 +120,241 @@ class Board:
         :return: None
         """
 
-        self.__solutions.append(board)
+        self.__add_space(board.get_space())
+
+    def __add_space(self, space: np.ndarray) -> None:
+        """
+        Add a solution's space to the board's packed solutions.
+
+        :param space: The space of the solution.
+        :return: None
+        """
+
+        self.__solutions += space.astype(np.int8, copy=False).tobytes()
 
     def solve(self) -> bool:
         """
         Solve the board.
 
-        :return: True if the board is solved, False if not.
+        :return: True if the board is solved, False if not. get_status says whether the search
+         finished or was stopped early by a limit.
         """
-        self.__start_solve = time()
-        self.recursive_solve(self, self.__pieces[1:])
+
+        self.__status_source = None
+
+        # The database and cache only hold the first solution, so they can only answer a limit of 1
+        record = self.__database_lookup() if self.__limit == 1 else None
+        if record is not None:
+            count, space = record
+            if count > 0:
+                self.__add_space(space)
+                self.__space = space.copy()
+            return count > 0
+
+        cache = self.__get_solution_cache() if self.__limit == 1 else None
+        space = cache.get_solution(self.__blockers) if cache is not None else None
+        if space is not None:
+            self.__add_space(space)
+            self.__space = space
+            return True
+
+        for space in self.__iter_solutions(self.__limit):
+            self.__add_space(space)
+            if self.__limit is not None and self.get_solution_count() >= self.__limit:
+                break
 
         # if we have solutions, set the board to the first solution's board
-        if len(self.__solutions) > 0:
-            self.__space = self.__solutions[0].get_space()
+        if self.get_solution_count() > 0:
+            self.__space = self.__unpack_solution(0)
+            if cache is not None:
+                cache.add_solution(self.__blockers, self.__space)
+
+        return self.get_solution_count() > 0
+
+    def iter_solutions(self) -> t.Iterator[np.ndarray]:
+        """
+        Lazily find the solutions of the board, yielding each one as soon as it is found. Each
+        solution is a 6x6 int8 grid of piece UUIDs, in the same layout as get_space. This doesn't
+        use the solution limit or store the solutions, so the caller can stop at any point, but the
+        time limit counts from when iteration starts.
+
+        :return: An iterator of solution grids.
+        """
 
-        return len(self.__solutions) > 0
+        return self.__iter_solutions(None)
+
+    def __iter_solutions(self, limit: t.Optional[int]) -> t.Iterator[np.ndarray]:
+        """
+        Lazily find the solutions of the board, as in iter_solutions.
+
+        :param limit: The most solutions the caller needs, or None. Only the parallel engine uses
+         this, so that its workers don't search for more solutions than this.
+        :return: An iterator of solution grids.
+        """
+
+        pieces = PIECES[1:]
+
+        if self.__engine == 'numpy':
+            # search from the blockers, as this board may already hold a solution from solve(),
+            # and put its space back however the caller stops
+            space = self.__space
+            self.__space = self.__create_space()
+            self.__search_limit.start()
+            self.__status_source = self.__search_limit
+            try:
+                for _ in self.__recursive_search(pieces, 0):
+                    yield self.get_space()
+            finally:
+                self.__space = space
+            return
+
+        table = get_placement_table(pieces)
+        if self.__engine == 'parallel':
+            # imported here, as multiprocessing is slow to import and most boards don't need it
+            from parallel import ParallelSolver  # pylint: disable=C0415
+            solver = ParallelSolver(table, self.__blockers, self.__time_limit, self.__processes,
+                                    cancel=self.__cancel)
+            solutions = solver.iter_solutions(limit)
+        elif self.__engine == 'bitboard':
+            solver = BitboardSolver(table, self.__blockers, self.__time_limit, stats=self.__stats,
+                                    max_nodes=self.__max_nodes, cancel=self.__cancel)
+            solutions = solver.iter_solutions()
+        else:
+            solver = DLXSolver(table, self.__blockers, self.__time_limit, self.__max_nodes,
+                               self.__cancel)
+            solutions = solver.iter_solutions()
+        self.__status_source = solver
+
+        for placements in solutions:
+            space = self.__create_space()
+            for placement in placements:
+                piece = pieces[placement.piece]
+                piece_mask = piece.get_masks()[placement.orientation]
+                piece_rows, piece_cols = piece_mask.shape
+                space[placement.row:placement.row + piece_rows,
+                      placement.col:placement.col + piece_cols] += piece_mask * piece.get_uuid()
+            yield space
+
+    def __create_space(self) -> np.ndarray:
+        """
+        Create the space for the board with only the blockers placed.
+
+        :return: The space for the board.
+        """
+
+        space = np.zeros((6, 6), np.int8)
+        for blocker in self.__blockers:
+            space[blocker[0], blocker[1]] += PIECES[0].get_uuid()
+        return space
+
+    def count_solutions(self) -> int:
+        """
+        Count every solution of the board, without building a Board for each of them. This is
+        read from the solution database or cache if they have it, otherwise it always uses the
+        bitboard engine.
+
+        :return: The number of solutions.
+        :raises TimeoutError: If the search is stopped by a limit before every solution is
+         counted.
+        """
+
+        record = self.__database_lookup()
+        if record is not None:
+            return record[0]
+
+        cache = self.__get_solution_cache()
+        count = cache.get_count(self.__blockers) if cache is not None else None
+        if count is not None:
+            return count
+
+        pieces = PIECES[1:]
+        solver = BitboardSolver(get_placement_table(pieces), self.__blockers, self.__time_limit,
+                                stats=self.__stats, max_nodes=self.__max_nodes,
+                                cancel=self.__cancel)
+        count = solver.count()
+        if cache is not None:
+            cache.add_count(self.__blockers, count)
+        return count
+
+    def __database_lookup(self) -> t.Optional[tuple[int, np.ndarray]]:
+        """
+        Look up the board's blockers in the solution database.
+
+        :return: The solution count and first solution's space, or None if the database is not
+         being used, has not been built, or does not have these blockers.
+        """
+
+        if not self.__use_database:
+            return None
+
+        database = get_default_database()
+        if database is None:
+            return None
+        return database.lookup(self.__blockers)
+
+    def __get_solution_cache(self) -> t.Optional[SolutionCache]:
+        """
+        Get the solution cache of the pieces, which holds the boards already solved in this
+        process by the canonical form of their blockers.
+
+        :return: The solution cache, or None if stored answers are not being used.
+        """
+
+        if not self.__use_database:
+            return None
+        return get_solution_cache(get_placement_table(PIECES[1:]))
 
     def get_space(self) -> np.ndarray:
         """
-        Get the space for the board. This is deepcopied to prevent modification.
+        Get the space for the board. This is copied to prevent modification.
 
         :return: The space for the board.
         """
 
-        return deepcopy(self.__space)
+        return self.__space.copy()
 
     def get_solutions(self) -> list[t.Self]:
         """
-        Get the solutions for the board.
+        Get the solutions for the board. These are unpacked into new boards on each call, so use
+        get_solution_count or get_packed_solutions for many solutions.
 
         :return: The solutions for the board.
         """
 
-        return self.__solutions
+        return [self.__snapshot(self.__unpack_solution(index))
+                for index in range(self.get_solution_count())]
+
+    def get_solution_count(self) -> int:
+        """
+        Get the number of solutions found for the board.
+
+        :return: The number of solutions.
+        """
+
+        return len(self.__solutions) // (BOARD_SIZE * BOARD_SIZE)
+
+    def get_packed_solutions(self) -> bytes:
+        """
+        Get the solutions for the board, packed as 36 bytes per solution. Each solution is its
+        space as int8 piece UUIDs in row order, and can be unpacked with
+        np.frombuffer(packed, np.int8).reshape((6, 6)).
+
+        :return: The packed solutions.
+        """
+
+        return bytes(self.__solutions)
+
+    def __unpack_solution(self, index: int) -> np.ndarray:
+        """
+        Unpack one of the board's solutions.
+
+        :param index: The index of the solution.
+        :return: A new space holding the solution.
+        """
+
+        size = BOARD_SIZE * BOARD_SIZE
+        return np.frombuffer(self.__solutions, np.int8, size, index * size) \
+            .reshape((BOARD_SIZE, BOARD_SIZE)).copy()
 
     def place_piece(self, row: int, col: int, piece: Piece, orientation: int = 0) -> None:
         """
@@ -113,6 +372,50 @@ class Board:
         add_slice = piece_mask * piece.get_uuid()
         board_slice[:] += add_slice  # replace the range
 
+    def remove_piece(self, row: int, col: int, piece: Piece, orientation: int = 0) -> None:
+        """
+        Remove a piece that was placed on the board with place_piece.
+
+        :param row: The row the piece was placed at.
+        :param col: The column the piece was placed at.
+        :param piece: The piece to remove.
+        :param orientation: The orientation the piece was placed with.
+        :return: None
+        """
+        piece_mask = piece.get_masks()[orientation]
+        piece_rows, piece_cols = piece_mask.shape
+        board_slice = self.__space[row:row + piece_rows, col:col + piece_cols]
+        board_slice[:] -= piece_mask * piece.get_uuid()
+
+    def __snapshot(self, space: np.ndarray) -> t.Self:
+        """
+        Create a board holding a solution, with the same blockers and settings as this board. It
+        gets its own search limits and no stats or cancel token, so solving it doesn't change
+        this board's status or stats.
+
+        :param space: The space to give the new board.
+        :return: The new board.
+        """
+
+        # The slots are set directly, as the constructor would build the space from the blockers
+        # pylint: disable=W0212,W0238
+        solution = object.__new__(Board)
+        solution.__blockers = self.__blockers
+        solution.__solutions = bytearray()
+        solution.__limit = self.__limit
+        solution.__time_limit = self.__time_limit
+        solution.__engine = self.__engine
+        solution.__use_database = self.__use_database
+        solution.__processes = self.__processes
+        solution.__stats = None
+        solution.__max_nodes = self.__max_nodes
+        solution.__cancel = None
+        solution.__search_limit = SearchLimit(self.__time_limit, self.__max_nodes)
+        solution.__status_source = None
+        solution.__space = space
+        # pylint: enable=W0212,W0238
+        return solution
+
     def piece_fits_at_space(self, row: int, col: int, piece: Piece):
         """
         Checks if a Piece can fit on the Board at the given row & column,
@@ -144,6 +447,30 @@ class Board:
 
         return None  # does not fit
 
+    def piece_orientations_at_space(self, row: int, col: int, piece: Piece) -> t.List[int]:
+        """
+        Gets every orientation of a Piece that can fit on the Board at the given row & column.
+        The top-left of the piece mask will be used as the origin.
+
+        :param row: The row to check.
+        :param col: The column to check.
+        :param piece: The piece to check.
+        :return: The indexes to the Piece's masks for every orientation that fits on the Board.
+        """
+
+        orientations = []
+        for mask_index, piece_mask in enumerate(piece.get_masks()):
+            piece_rows, piece_cols = piece_mask.shape
+            board_slice = self.__space[row:row + piece_rows, col:col + piece_cols]
+
+            if board_slice.shape != piece_mask.shape:
+                continue  # the piece extends past the edge of the board
+
+            if np.array_equal((board_slice == 0) & piece_mask, piece_mask):
+                orientations.append(mask_index)
+
+        return orientations
+
     def __str__(self) -> str:
         """
         String representation of the board.
@@ -164,7 +491,7 @@ class Board:
                     col = self.__get_piece_text_colour_by_id(uuid)
 
                 if col is not None:
-                    if uuid == self.__pieces[0].get_uuid():
+                    if uuid == PIECES[0].get_uuid():
                         return_string += (col + ' ● ')
                     else:
                         return_string += (col + " ■ ")
@@ -181,58 +508,12 @@ class Board:
         :return: The text colour.
         """
         found_id = 0
-        for piece in self.__pieces:
+        for piece in PIECES:
             if piece.get_uuid() == uuid:
                 found_id = piece
                 break
         return found_id.get_color()
 
-    @staticmethod
-    def __create_pieces() -> t.List[Piece]:
-        """
-        Create the pieces for the board.
-
-        :return: The list of pieces to use.
-        """
-
-        blocker = Piece(1,'Blocker',
-                            "\u001b[38;5;94m", [0.6, 0.4, 0.05],
-                            [[True]])
-        blue = (Piece(2,'Blue',
-                            "\u001b[38;5;21m", [0, 0, 1.0],
-                            [[True]]))
-        brown = (Piece(3,'Brown',
-                            "\u001b[38;5;52m", [0.5, 0.3, 0.3],
-                            [[True, True]]))
-        orange = (Piece(4,'Orange',
-                            "\u001b[38;5;208m", [1.0, 0.4, 0],
-                            [[True, True, True]]))
-        grey = (Piece(5,'Grey',
-                            "\u001b[38;5;248m", [0.5, 0.5, 0.5],
-                            [[True, True, True, True]]))
-        red =(Piece(6,'Red',
-                            "\u001b[38;5;1m", [1.0, 0, 0],
-                            [[False, True, True], [True, True, False]]))
-        yellow = (Piece(7,'Yellow',
-                            "\u001b[38;5;11m", [1.0, 0.7, 0],
-                            [[True, True, True],
-                             [False, True, False]]))
-        cyan = (Piece(8,'Cyan',
-                            "\u001b[38;5;45m", [0.2, 0.5, 1.0],
-                            [[True, True, True], [True, False, False]]))
-        green = (Piece(9,'Green',
-                            "\u001b[38;5;22m", [0, 1.0, 0],
-                            [[True, True], [True, True]]))
-        purple = (Piece(10,'Purple',
-                            "\u001b[38;5;54m", [0.5, 0, 0.5],
-                            [[True, True], [True, False]]))
-
-#  pieces = {Blocker,Grey,Red,Yellow,Cyan,Orange,Green,Purple,Brown,Blue};
-#         pieces = [blocker, blue, brown, orange, grey, red, yellow, cyan, green, purple]
-        pieces = [blocker,grey,red,yellow,cyan,orange,green,purple,brown,blue]
-
-        return pieces
-
     def is_solved(self) -> bool:
         """
         Gets whether the board is solved or not (any squares  unfilled).
@@ -242,46 +523,60 @@ class Board:
 
         return 0 not in self.__space
 
-    def recursive_solve(self, root_board: t.Self, remaining: t.List[Piece]) -> bool:
+    def recursive_solve(self, root_board: t.Self, remaining: t.List[Piece], depth: int = 0) -> bool:
         """
-        Recursive function to solve the puzzle and adds solutions to self.__solutions list.
+        Recursive function to solve the puzzle and adds solutions to the root board's solutions.
+        Pieces are placed and removed on this board in place, and it is only copied when a solution
+        is found. The search stops at this board's limits, which count from when this is called.
 
         :param root_board: The original board object, to add solutions to.
-        :param remaining: List of pieces available to place.
-        :return: True if a solution was found or max solutions found, False if no solution found.
+        :param remaining: List of pieces to place, in order.
+        :param depth: The index in remaining of the piece to place next.
+        :return: True if max solutions found, False if not.
         """
 
-        piece = remaining[0]  # The piece to try and fit in
+        limit = root_board.get_solution_limit()
+        self.__search_limit.start()
+        self.__status_source = self.__search_limit
+        for _ in self.__recursive_search(remaining, depth):
+            # The board is solved, add a copy of it to the root board's solutions.
+            root_board.add_solution(self)
+            # If we have found 10 solutions, return True to exit out of the recursion.
+            if limit is not None and root_board.get_solution_count() >= limit:
+                return True
 
-        # If we have been solving for more than 20 seconds, return False
-        if root_board.get_out_of_time():
-            return False
+        return False
 
-        # Go through all rows and columns to see if we can fit this piece in
-        for row in range(6):
-            for col in range(6):
+    def __recursive_search(self, remaining: t.List[Piece], depth: int) -> t.Iterator[None]:
+        """
+        Recursive generator that yields each time this board is solved. Pieces are placed and
+        removed on this board in place, so it must not be changed while the generator is paused.
 
-                # Get the index orientation of the piece that fits. Or None if it doesn't fit
-                orientation = self.piece_fits_at_space(row, col, piece)
+        :param remaining: List of pieces to place, in order.
+        :param depth: The index in remaining of the piece to place next.
+        :return: An iterator that yields None for each solution.
+        """
+
+        piece = remaining[depth]  # The piece to try and fit in
 
-                if orientation is not None:
-                    # Create a new board with the piece placed so it doesn't affect other
-                    # recursive instances.
-                    new_board = deepcopy(self)
-                    new_board.place_piece(row, col, piece, orientation)
-                    new_remaining = remaining.copy()
-                    new_remaining.remove(piece)
+        # Every so many nodes, check whether a limit has been reached and stop searching if so
+        if self.__search_limit.count_node():
+            return
 
-                    if new_board.is_solved():
-                        # If the board is solved, add it to the root board's solutions list.
-                        root_board.add_solution(new_board)
-                        # If we have found 10 solutions, return True to exit out of the recursion.
-                        return len(root_board.get_solutions()) >= root_board.get_solution_limit()
+        # Go through all rows and columns to see if we can fit this piece in
+        for row in range(6):
+            for col in range(6):
 
-                    # We still have pieces to place, so recursively call this function again.
-                    hit_limit = new_board.recursive_solve(root_board, new_remaining)
+                # Try every orientation of the piece that fits here, not just the first one, so
+                # that every solution is found.
+                for orientation in self.piece_orientations_at_space(row, col, piece):
+                    self.place_piece(row, col, piece, orientation)
 
-                    if hit_limit:  # Limit reached in a deeper call
-                        return True  # exit out of the recursion
+                    if self.is_solved():
+                        yield None
+                    else:
+                        # We still have pieces to place, so recursively search again.
+                        yield from self.__recursive_search(remaining, depth + 1)
 
-        return False  # No possible solutions with this current recursive state.
+                    # Take the piece back off so the board is as it was for the next position.
+                    self.remove_piece(row, col, piece, orientation)
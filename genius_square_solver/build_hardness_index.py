@@ -0,0 +1,74 @@
+"""
+This is the code file to build the hardness index for the Genius Square Solver project.
+It measures the search effort of every distinct blocker set the dice can produce, and writes the
+results to hardness_index.DEFAULT_PATH.
+"""
+
+import typing as t
+from multiprocessing import Pool
+from time import time
+
+from bitboard import BitboardSolver, blockers_to_mask
+from dice_combinations import DiceCombo
+from hardness_index import DEFAULT_PATH, write_index
+from piece import PIECES
+from placements import get_placement_table
+from search_stats import SearchStats
+
+
+def measure_hardness(blockers: t.List[t.Any]) -> tuple[int, int]:
+    """
+    Count the nodes the bitboard engine expands to find the first solution of a blocker set.
+
+    :param blockers: A list of the blocker positions.
+    :return: The (blocker mask, node count) record.
+    """
+
+    # Without the shared dead state cache, so the count doesn't depend on the boards before it
+    stats = SearchStats()
+    solver = BitboardSolver(get_placement_table(PIECES[1:]), blockers, time_limit=600,
+                            dead_states=False, stats=stats)
+    solver.solve(1)
+
+    return blockers_to_mask(blockers), stats.get_nodes()
+
+
+def build_index(path: str, blocker_sets: t.Optional[t.List[t.List[t.Any]]] = None,
+                processes: t.Optional[int] = None) -> int:
+    """
+    Build a hardness index.
+
+    :param path: The path to write the index to.
+    :param blocker_sets: The blocker sets to measure, every distinct dice outcome if None.
+    :param processes: The number of worker processes, or None for one per CPU.
+    :return: The number of records written.
+    """
+
+    if blocker_sets is None:
+        blocker_sets = DiceCombo.get_distinct_blockers()
+
+    records = []
+    start = time()
+    with Pool(processes) as pool:
+        for record in pool.imap_unordered(measure_hardness, blocker_sets, chunksize=64):
+            records.append(record)
+            if len(records) % 5000 == 0:
+                print(f"Measured: {len(records)}/{len(blocker_sets)}, "
+                      f"Elapsed: {round(time() - start)}s")
+
+    return write_index(path, records)
+
+
+def main() -> None:
+    """
+    The main function to build the hardness index.
+
+    :return: None
+    """
+
+    count = build_index(DEFAULT_PATH)
+    print(f"Wrote {count} blocker sets to {DEFAULT_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+This is the code file to build the solution database for the Genius Square Solver project.
+It solves every distinct blocker set the dice can produce once, up to rotation and reflection,
+and writes the results to solution_db.DEFAULT_PATH.
+"""
+
+import typing as t
+from multiprocessing import Pool
+from time import time
+import numpy as np
+
+from board import Board
+from dice_combinations import DiceCombo
+from solution_db import DEFAULT_PATH, pack_space, write_database
+from symmetry import canonicalize, transform_blockers
+
+
+def solve_record(blockers: t.List[t.Any]) -> tuple[int, int, bytes]:
+    """
+    Solve a blocker set for the database.
+
+    :param blockers: A list of the blocker positions, in canonical form.
+    :return: The (blocker mask, solution count, packed first solution) record.
+    """
+
+    board = Board(blockers, limit=1, time_limit=600, use_database=False)
+    board.solve()
+    count = board.count_solutions()
+    space = board.get_space() if count > 0 else np.zeros((6, 6), np.int8)
+
+    return canonicalize(blockers)[0], count, pack_space(space)
+
+
+def build_database(path: str, blocker_sets: t.Optional[t.List[t.List[t.Any]]] = None,
+                   processes: t.Optional[int] = None) -> int:
+    """
+    Build a solution database.
+
+    :param path: The path to write the database to.
+    :param blocker_sets: The blocker sets to solve, every distinct dice outcome if None.
+    :param processes: The number of worker processes, or None for one per CPU.
+    :return: The number of records written.
+    """
+
+    if blocker_sets is None:
+        blocker_sets = DiceCombo.get_distinct_blockers()
+
+    # only solve one blocker set of each set of symmetric ones
+    canonical_sets = {}
+    for blockers in blocker_sets:
+        key, transform = canonicalize(blockers)
+        canonical_sets[key] = transform_blockers(blockers, transform)
+    blocker_sets = list(canonical_sets.values())
+
+    records = []
+    start = time()
+    with Pool(processes) as pool:
+        for record in pool.imap_unordered(solve_record, blocker_sets, chunksize=64):
+            records.append(record)
+            if len(records) % 1000 == 0:
+                print(f"Solved: {len(records)}/{len(blocker_sets)}, "
+                      f"Elapsed: {round(time() - start)}s")
+
+    return write_database(path, records)
+
+
+def main() -> None:
+    """
+    The main function to build the solution database.
+
+    :return: None
+    """
+
+    count = build_database(DEFAULT_PATH)
+    print(f"Wrote {count} blocker sets to {DEFAULT_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+This is the code file for checking that the blockers are read correctly from the board photos in
+res at a range of target sizes, eg after changing how the circles are found:
+    python check_detection.py
+    python check_detection.py --target-sizes 640 768 --reduction 4
+It also makes widescreen videos of the photos and checks the live reader reads them. It prints
+each check that reads the wrong blockers or fails, and exits with 1 if any do.
+"""
+
+# pylint: disable=E1101
+
+import argparse
+import os
+import sys
+import tempfile
+import typing as t
+import cv2
+import numpy as np
+
+from image_processor import ImageReader
+from live_reader import LiveReader
+
+# The folder the photos are in.
+RES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'res')
+
+# The blockers on each photo.
+EXPECTED_BLOCKERS: t.Dict[str, t.Set[str]] = {
+    'test2.jpg': {'A5', 'A6', 'B3', 'C1', 'D4', 'D6', 'F5'},
+    'test_board.jpg': {'B1', 'C4', 'C5', 'F1', 'F2', 'F3', 'F4'},
+}
+
+# The target sizes checked by default, from the smallest that is useful to larger than the photos.
+DEFAULT_TARGET_SIZES = [512, 576, 640, 704, 768, 832, 896, 960, 1024, 1200, 1600, 2000, 3000, 5000]
+
+# The (width, height) of the videos made.
+VIDEO_SIZES = [(1280, 720), (1920, 1080)]
+
+# The parts of each video: the photo, the grey level around it, and how far right of the middle of
+# the frame it is. Moving the same photo a little checks the board is found again where it was.
+VIDEO_PARTS = [('test2.jpg', 0, 0), ('test_board.jpg', 128, 0), ('test_board.jpg', 128, 80),
+               ('test2.jpg', 255, -80)]
+
+# The number of frames each part of a video lasts.
+PART_FRAMES = 10
+
+
+def check_photo(name: str, target_size: int, reduction: int) -> t.Optional[str]:
+    """
+    Read the blockers from a photo and check they are the right ones.
+
+    :param name: The file name of the photo in res.
+    :param target_size: The target size to find the circles at.
+    :param reduction: The reduction to decode the photo at.
+    :return: What went wrong, or None if the blockers are right.
+    """
+
+    reader = ImageReader(os.path.join(RES_DIR, name), target_size, reduction)
+    try:
+        reader.process()
+    except ValueError as error:
+        return str(error)
+
+    found = set(reader.get_marker_names())
+    if found != EXPECTED_BLOCKERS[name]:
+        return f"read {', '.join(sorted(found))}"
+    return None
+
+
+def make_frame(name: str, width: int, height: int, padding: int, shift: int) -> np.ndarray:
+    """
+    Make a video frame with a photo the height of the frame in it, with plain grey around it.
+
+    :param name: The file name of the photo in res.
+    :param width: The width of the frame.
+    :param height: The height of the frame.
+    :param padding: The grey level around the photo.
+    :param shift: How far right of the middle of the frame the photo is.
+    :return: The BGR frame.
+    """
+
+    photo = cv2.imread(os.path.join(RES_DIR, name))
+    scale = height / photo.shape[0]
+    photo = cv2.resize(photo, (round(photo.shape[1] * scale), height),
+                       interpolation=cv2.INTER_AREA)
+
+    frame = np.full((height, width, 3), padding, dtype=np.uint8)
+    left = (width - photo.shape[1]) // 2 + shift
+    frame[:, left:left + photo.shape[1]] = photo
+    return frame
+
+
+def check_video(width: int, height: int, target_size: int) -> t.List[str]:
+    """
+    Write a video of the photos in VIDEO_PARTS, read it with the live reader, and check the
+    blockers at the end of each part.
+
+    :param width: The width of the video.
+    :param height: The height of the video.
+    :param target_size: The target size to pass to the live reader.
+    :return: What went wrong in each part that didn't read correctly.
+    """
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'board.avi')
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (width, height))
+        for name, padding, shift in VIDEO_PARTS:
+            frame = make_frame(name, width, height, padding, shift)
+            for _ in range(PART_FRAMES):
+                writer.write(frame)
+        writer.release()
+
+        blockers = [result.blockers for result in LiveReader(target_size).read(path)]
+
+    problems = []
+    for part, (name, padding, shift) in enumerate(VIDEO_PARTS):
+        found = blockers[(part + 1) * PART_FRAMES - 1]
+        if found is None or set(found) != EXPECTED_BLOCKERS[name]:
+            read = f"read {', '.join(found)}" if found else "not found"
+            problems.append(f"{name} on grey {padding}, moved {shift}px: {read}")
+    return problems
+
+
+def main() -> None:
+    """
+    The main function to check the photos.
+
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description="Check the blockers read from the board photos.")
+    parser.add_argument('--target-sizes', type=int, nargs='+', default=DEFAULT_TARGET_SIZES,
+                        help="the target sizes to check")
+    parser.add_argument('--reduction', type=int, default=1, choices=[1, 2, 4, 8],
+                        help="decode the photos in grayscale at 1/N of their size")
+    parser.add_argument('--skip-video', action='store_true', help="don't check the videos")
+    args = parser.parse_args()
+
+    failures = 0
+    for name in EXPECTED_BLOCKERS:
+        for target_size in args.target_sizes:
+            problem = check_photo(name, target_size, args.reduction)
+            if problem is not None:
+                print(f"{name} at {target_size}px: {problem}")
+                failures += 1
+
+    checked = len(EXPECTED_BLOCKERS) * len(args.target_sizes)
+    if not args.skip_video:
+        for width, height in VIDEO_SIZES:
+            for target_size in args.target_sizes:
+                problems = check_video(width, height, target_size)
+                for problem in problems:
+                    print(f"{width}x{height} video at {target_size}px: {problem}")
+                failures += len(problems)
+                checked += len(VIDEO_PARTS)
+    print(f"{checked - failures} of {checked} read correctly")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+This module contains the dead state cache, a transposition table for the bitboard search.
+
+Different placement orders often cover the same squares with the same pieces left, so the search
+reaches the same state many times. A state with no solutions under it is remembered, so the next
+time it is reached its subtree is skipped. Whether a state has solutions only depends on the
+covered squares and the remaining pieces, not on the blockers, so one cache can be shared by every
+board solved with the same pieces.
+"""
+
+import typing as t
+from collections import OrderedDict
+from placements import PlacementTable
+
+# The default number of states each cache holds.
+DEFAULT_SIZE = 1 << 17
+
+
+class DeadStateCache:
+    """
+    This class is a bounded set of search states known to have no solutions. When it is full, the
+    least recently used state is dropped.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_SIZE) -> None:
+        """
+        Constructor to set up the cache.
+
+        :param max_size: The maximum number of states to hold.
+        :return: None
+        """
+
+        # error checking
+        if max_size < 1:
+            raise ValueError("Max size must be at least 1")
+
+        self.__max_size = max_size
+        self.__states: OrderedDict[int, None] = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @staticmethod
+    def get_key(occupied: int, remaining: int) -> int:
+        """
+        Get the key of a search state.
+
+        :param occupied: The 36-bit bitmask of covered squares.
+        :param remaining: The bitmask of the indexes of the pieces still to place.
+        :return: The key, with the remaining pieces above the covered squares.
+        """
+
+        return remaining << 36 | occupied
+
+    def is_dead(self, key: int) -> bool:
+        """
+        Check whether a state is known to have no solutions, and count the hit or miss.
+
+        :param key: The key of the state, from get_key.
+        :return: True if the state is in the cache.
+        """
+
+        if key in self.__states:
+            self.__states.move_to_end(key)
+            self.__hits += 1
+            return True
+
+        self.__misses += 1
+        return False
+
+    def add(self, key: int) -> None:
+        """
+        Remember that a state has no solutions.
+
+        :param key: The key of the state, from get_key.
+        :return: None
+        """
+
+        self.__states[key] = None
+        if len(self.__states) > self.__max_size:
+            self.__states.popitem(last=False)
+
+    def get_hits(self) -> int:
+        """
+        Get the number of lookups that found a dead state.
+
+        :return: The number of hits.
+        """
+
+        return self.__hits
+
+    def get_misses(self) -> int:
+        """
+        Get the number of lookups that didn't find a dead state.
+
+        :return: The number of misses.
+        """
+
+        return self.__misses
+
+    def get_hit_rate(self) -> float:
+        """
+        Get the fraction of lookups that found a dead state.
+
+        :return: The hit rate, or 0 if there have been no lookups.
+        """
+
+        lookups = self.__hits + self.__misses
+        return self.__hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        """
+        Forget every state and reset the counters.
+
+        :return: None
+        """
+
+        self.__states.clear()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self) -> int:
+        """
+        Get the number of states in the cache.
+
+        :return: The number of states.
+        """
+
+        return len(self.__states)
+
+
+# The shared cache of each placement table, so states are remembered across boards.
+_dead_state_caches: t.Dict[PlacementTable, DeadStateCache] = {}
+
+
+def get_dead_state_cache(table: PlacementTable) -> DeadStateCache:
+    """
+    Get the shared dead state cache for a placement table, creating it the first time.
+
+    :param table: The placement table the states are searched with.
+    :return: The cache.
+    """
+
+    if table not in _dead_state_caches:
+        _dead_state_caches[table] = DeadStateCache()
+    return _dead_state_caches[table]
@@ -56,3 +56,13 @@ def letter_coord_to_index(letter: str) -> tuple[int, int]:
     """
     letter = letter.upper().strip()
     return int(letter[1]) - 1, ord(letter[0]) - ord('A')
+
+
+def index_to_letter_coord(index: tuple[int, int]) -> str:
+    """
+    Convert an index to a letter coordinate. This is the inverse of letter_coord_to_index.
+
+    :param index: The (row, col) index.
+    :return: The letter coordinate.
+    """
+    return f"{'ABCDEF'[index[1]]}{index[0] + 1}"
@@ -2,6 +2,7 @@
 This class is used to easily get a die combination for the Genius Square game.
 """
 
+from itertools import product
 from dice import letter_coord_to_index
 
 
@@ -41,6 +42,20 @@ class DiceCombo:
 
         return [letter_coord_to_index(die) for die in selected_elements]
 
+    @staticmethod
+    def get_distinct_blockers() -> list[list[tuple[int, int]]]:
+        """
+        Get every distinct set of blockers the dice can produce. Some dice repeat faces, so there
+        are fewer distinct sets than the 6^7 dice outcomes.
+
+        :return: The distinct blocker sets.
+        """
+
+        distinct_faces = [list(dict.fromkeys(faces)) for faces in DiceCombo.all_dice_faces]
+
+        return [[letter_coord_to_index(die) for die in selected_elements]
+                for selected_elements in product(*distinct_faces)]
+
     @staticmethod
     def f(x) -> int:
         """
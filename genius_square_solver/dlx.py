@@ -0,0 +1,236 @@
+"""
+This module contains the Dancing Links (DLX) solver engine.
+
+The puzzle is solved as an exact cover problem, using Knuth's Algorithm X. There is a column for
+each empty square and one for each piece, and a row for each placement of a piece that doesn't
+cover a blocker. Each step branches on the column with the fewest rows left.
+"""
+
+# pylint: disable=R0902,R0913,R0914,R0917
+
+import typing as t
+from itertools import islice
+from bitboard import blockers_to_mask
+from placements import BOARD_SIZE, Placement, PlacementTable
+from search_limit import DEFAULT_CHECK_INTERVAL, CancelToken, SearchLimit
+
+
+class DLXSolver:
+    """
+    This class solves a board with Dancing Links. The links are stored in flat lists indexed by
+    node number rather than as node objects, as this is much faster in Python.
+    """
+
+    def __init__(self, table: PlacementTable, blockers: t.List[t.Any],
+                 time_limit: float = 20, max_nodes: t.Optional[int] = None,
+                 cancel: t.Optional[CancelToken] = None,
+                 check_interval: int = DEFAULT_CHECK_INTERVAL) -> None:
+        """
+        Constructor to set up the solver and build the links.
+
+        :param table: The placement table of the pieces to place.
+        :param blockers: A list of the blocker positions to use.
+        :param time_limit: The maximum number of seconds to search for.
+        :param max_nodes: The maximum number of nodes to expand in a search, or None for no limit.
+        :param cancel: A token to cancel the search with from another thread, or None.
+        :param check_interval: The number of nodes between checks of the time and cancel token.
+        :return: None
+        """
+
+        self.__limit = SearchLimit(time_limit, max_nodes, cancel, check_interval)
+
+        blocked = blockers_to_mask(blockers)
+        cells = [cell for cell in range(BOARD_SIZE * BOARD_SIZE) if not blocked >> cell & 1]
+        piece_count = len(table.get_pieces())
+
+        # Node 0 is the root, then one header per column, then the placement nodes.
+        column_count = len(cells) + piece_count
+        self.__left = [column - 1 for column in range(column_count + 1)]
+        self.__right = [column + 1 for column in range(column_count + 1)]
+        self.__left[0] = column_count
+        self.__right[column_count] = 0
+        self.__up = list(range(column_count + 1))
+        self.__down = list(range(column_count + 1))
+        self.__column = list(range(column_count + 1))
+        self.__size = [0] * (column_count + 1)
+        self.__row_placement: t.List[t.Optional[Placement]] = [None] * (column_count + 1)
+
+        cell_column = {cell: index + 1 for index, cell in enumerate(cells)}
+        for piece_index in range(piece_count):
+            piece_column = len(cells) + piece_index + 1
+            for placement in table.get_placements(piece_index):
+                if placement.bits & blocked:
+                    continue
+                columns = [cell_column[cell] for cell in cells if placement.bits >> cell & 1]
+                self.__add_row(placement, columns + [piece_column])
+
+    def __add_row(self, placement: Placement, columns: t.List[int]) -> None:
+        """
+        Add a row of nodes for a placement, linked into the given columns.
+
+        :param placement: The placement the row represents.
+        :param columns: The columns the placement covers.
+        :return: None
+        """
+
+        first = len(self.__column)
+        for offset, column in enumerate(columns):
+            node = first + offset
+            self.__left.append(node - 1 if offset else first + len(columns) - 1)
+            self.__right.append(node + 1 if offset < len(columns) - 1 else first)
+
+            # add the node to the bottom of the column
+            self.__up.append(self.__up[column])
+            self.__down.append(column)
+            self.__down[self.__up[column]] = node
+            self.__up[column] = node
+
+            self.__column.append(column)
+            self.__row_placement.append(placement)
+            self.__size[column] += 1
+
+    def __cover(self, column: int) -> None:
+        """
+        Remove a column from the header list, and every row in it from the other columns.
+
+        :param column: The column to cover.
+        :return: None
+        """
+
+        left, right, up, down, size = self.__left, self.__right, self.__up, self.__down, self.__size
+        right[left[column]] = right[column]
+        left[right[column]] = left[column]
+
+        row = down[column]
+        while row != column:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                size[self.__column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def __uncover(self, column: int) -> None:
+        """
+        Undo a call to __cover, in reverse order.
+
+        :param column: The column to uncover.
+        :return: None
+        """
+
+        left, right, up, down, size = self.__left, self.__right, self.__up, self.__down, self.__size
+
+        row = up[column]
+        while row != column:
+            node = left[row]
+            while node != row:
+                size[self.__column[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+
+        right[left[column]] = column
+        left[right[column]] = column
+
+    def __choose_column(self) -> int:
+        """
+        Choose the column with the fewest rows left.
+
+        :return: The column to branch on.
+        """
+
+        right, size = self.__right, self.__size
+        best = right[0]
+        column = right[best]
+        while column != 0 and size[best] > 0:
+            if size[column] < size[best]:
+                best = column
+            column = right[column]
+        return best
+
+    def solve(self, limit: t.Optional[int]) -> t.List[t.List[Placement]]:
+        """
+        Solve the board.
+
+        :param limit: The maximum number of solutions to find, or None to find every solution.
+        :return: A list of solutions, each a list of placements.
+        """
+
+        return list(islice(self.iter_solutions(), limit))
+
+    def iter_solutions(self) -> t.Iterator[t.List[Placement]]:
+        """
+        Lazily find the solutions of the board, yielding each one as soon as it is found. The
+        time limit counts from when this is called.
+
+        :return: An iterator of solutions, each a list of placements.
+        """
+
+        self.__limit.start()
+        return self.__search([])
+
+    def get_status(self) -> str:
+        """
+        Get whether the last search finished or what stopped it.
+
+        :return: The status, one of the statuses in search_limit.
+        """
+
+        return self.__limit.get_status()
+
+    def get_node_count(self) -> int:
+        """
+        Get the number of nodes expanded in the last search.
+
+        :return: The number of nodes.
+        """
+
+        return self.__limit.get_nodes()
+
+    def __search(self, placed: t.List[Placement]) -> t.Iterator[t.List[Placement]]:
+        """
+        Recursive generator that yields solutions for the current search state.
+
+        :param placed: The placements made so far.
+        :return: An iterator of solutions.
+        """
+
+        if self.__right[0] == 0:
+            yield list(placed)
+            return
+
+        # Every so many nodes, check whether a limit has been reached and stop searching if so
+        if self.__limit.count_node():
+            return
+
+        column = self.__choose_column()
+        if self.__size[column] == 0:
+            return  # a square or piece that can't be covered any more
+
+        right, left, down = self.__right, self.__left, self.__down
+        self.__cover(column)
+
+        # The links are restored in finally blocks, so the solver can be reused even when the
+        # caller stops iterating early.
+        try:
+            row = down[column]
+            while row != column:
+                node = right[row]
+                while node != row:
+                    self.__cover(self.__column[node])
+                    node = right[node]
+
+                placed.append(self.__row_placement[row])
+                try:
+                    yield from self.__search(placed)
+                finally:
+                    placed.pop()
+                    node = left[row]
+                    while node != row:
+                        self.__uncover(self.__column[node])
+                        node = left[node]
+                row = down[row]
+        finally:
+            self.__uncover(column)
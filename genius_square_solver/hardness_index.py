@@ -0,0 +1,125 @@
+"""
+This module contains the hardness index, which holds how much search effort every blocker set the
+dice can produce takes to solve, so hard boards can be routed to a cache or a bigger worker before
+they are solved. It is built by build_hardness_index.py.
+
+The hardness of a board is the number of nodes the bitboard engine expands to find its first
+solution, which unlike wall time doesn't depend on the machine. The search order depends on the
+orientation of the blockers, so every blocker set is stored, not just one of each symmetric set.
+
+The file is a header followed by fixed-width records sorted by blocker mask, each holding the
+36-bit blocker mask and the node count.
+"""
+
+import os
+import typing as t
+import numpy as np
+from bitboard import blockers_to_mask
+from mapped_file import HEADER, DefaultFile, map_records, write_header
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'res',
+                            'hardness.gshi')
+
+MAGIC = b'GSHI'
+VERSION = 1
+RECORD = np.dtype([('mask', '<u8'), ('nodes', '<u4')])  # blocker mask, node count
+
+
+def write_index(path: str, records: t.Iterable[tuple[int, int]]) -> int:
+    """
+    Write a hardness index file.
+
+    :param path: The path to write the file to.
+    :param records: The (blocker mask, node count) records.
+    :return: The number of records written.
+    """
+
+    array = np.array(sorted(dict(records).items()), RECORD)
+    with open(path, 'wb') as file:
+        write_header(file, MAGIC, VERSION, len(array))
+        file.write(array.tobytes())
+    return len(array)
+
+
+class HardnessIndex:
+    """
+    This class reads a hardness index file through a read-only memory map, and looks up blocker
+    sets by binary search on their mask.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Constructor to map the index.
+
+        :param path: The path to the index file.
+        :return: None
+        """
+
+        self.__data, count = map_records(path, MAGIC, VERSION, RECORD.itemsize, 'hardness index')
+        self.__records = np.frombuffer(self.__data, RECORD, count, HEADER.size)
+        self.__sorted_nodes: t.Optional[np.ndarray] = None
+
+    def lookup(self, blockers: t.List[t.Any]) -> t.Optional[int]:
+        """
+        Look up the hardness of a blocker set.
+
+        :param blockers: A list of the blocker positions.
+        :return: The number of nodes expanded to find the first solution, or None if the blocker
+         set is not in the index.
+        """
+
+        mask = blockers_to_mask(blockers)
+        index = int(np.searchsorted(self.__records['mask'], mask))
+        if index == len(self.__records) or int(self.__records['mask'][index]) != mask:
+            return None
+        return int(self.__records['nodes'][index])
+
+    def get_threshold(self, fraction: float) -> int:
+        """
+        Get the node count that a fraction of the blocker sets take at most, eg 0.99 to find the
+        hardest 1% of boards.
+
+        :param fraction: The fraction of the blocker sets, from 0 to 1.
+        :return: The node count.
+        """
+
+        if not 0 <= fraction <= 1:
+            raise ValueError("Fraction must be between 0 and 1")
+
+        if self.__sorted_nodes is None:
+            self.__sorted_nodes = np.sort(self.__records['nodes'])
+        return int(self.__sorted_nodes[min(len(self.__sorted_nodes) - 1,
+                                           int(fraction * len(self.__sorted_nodes)))])
+
+    def close(self) -> None:
+        """
+        Unmap the index. It can't be used after this.
+
+        :return: None
+        """
+
+        del self.__records
+        self.__sorted_nodes = None
+        self.__data.close()
+
+    def __len__(self) -> int:
+        """
+        Get the number of blocker sets in the index.
+
+        :return: The number of blocker sets.
+        """
+
+        return len(self.__records)
+
+
+_default_index = DefaultFile(DEFAULT_PATH, HardnessIndex)
+
+
+def get_default_index() -> t.Optional[HardnessIndex]:
+    """
+    Get the index at DEFAULT_PATH, mapping it only the first time it is asked for.
+
+    :return: The index, or None if it has not been built.
+    """
+
+    return _default_index.get()
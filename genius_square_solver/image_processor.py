@@ -3,36 +3,108 @@ This module reads in an image of a Genius Square board and pieces,
 and processes it to create a board object.
 """
 
-# pylint: disable=E1101, R0914
+# pylint: disable=E1101, R0902, R0914
 
 
+import os
 from copy import deepcopy
+from time import perf_counter
+import typing as t
 import cv2
 import numpy as np
 
+# The default length of the longest side of the image that circles are found on.
+DEFAULT_TARGET_SIZE = 768
+
+# The flags that decode an image in grayscale at 1/2, 1/4 and 1/8 of its size. JPEG images are
+# scaled while they are decoded, which is much faster than decoding the full image.
+REDUCED_GRAYSCALE = {
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+# An image to read: a path, the bytes of an encoded image, or a decoded image.
+ImageSource = t.Union[str, os.PathLike, bytes, bytearray, memoryview, np.ndarray]
+
+# How far in from the orientation markers the centres of the outer squares are, as a fraction of
+# the distance between the markers.
+MARKER_INSET = 0.08
+
+# How far the orientation markers may be from the corners of a square: the shorter side must be at
+# least this fraction of the longer, and the cosine of the angle between them at most this.
+MARKER_SQUARENESS = 0.75
+MAX_MARKER_COSINE = 0.2
+
+# The most times bigger the largest blocker found on a shrunk image may be than the smallest.
+MAX_BLOCKER_SPREAD = 1.5
+
+# The parts of the longest side of the image the board may fill, in the order they are tried. It
+# fills most of a photo, and a little over half of a widescreen video frame.
+BOARD_FRACTIONS = (1.0, 0.75, 0.5)
+
+# The smallest and largest lengths of the board, in pixels, to look for the circles at when they
+# aren't found at the target size. The orientation markers are too small to find reliably below the
+# smallest, and the hand drawn circles too uneven above the largest.
+MIN_DETECTION_SIZE = 448
+MAX_DETECTION_SIZE = 1024
+
 
 class ImageReader:
     """
     This class reads in an image of a Genius Square board and pieces.
     """
 
-    def __init__(self, path: str) -> None:
+    def __init__(self, source: ImageSource, target_size: t.Optional[int] = DEFAULT_TARGET_SIZE,
+                 reduction: int = 1) -> None:
         """
         Initialize the ImageReader object.
 
-        :param path: The path to the image file.
+        :param source: The path to the image file, the bytes of an encoded image as bytes, a
+         buffer or a 1D uint8 array, or an image that is already decoded as a BGR array. Buffers
+         are decoded without being copied.
+        :param target_size: The length of the longest side of the image to find the blockers and
+         orientation markers on. Larger images are shrunk to this first, which is much faster and
+         is scaled back after. Smaller sizes are tried if the circles found don't make a board.
+         None finds them on the full size image, with the original two passes.
+        :param reduction: 2, 4 or 8 to decode the image in grayscale at that fraction of its size
+         to find the circles on, which is faster and uses less memory than decoding it in full.
+         The full image is then only decoded if get_image is called. 1 decodes it in full. Less
+         reduction is used when the reduced image would be smaller than target_size.
         """
-        self.__path = path
+
+        # error checking
+        if target_size is not None and target_size < 64:
+            raise ValueError("Target size must be at least 64 pixels")
+        if reduction != 1 and reduction not in REDUCED_GRAYSCALE:
+            raise ValueError("Reduction must be 1, 2, 4 or 8")
+        if reduction != 1 and target_size is None:
+            raise ValueError("Reduction needs a target size, the full size search is in pixels")
+
+        self.__source = source
+        self.__target_size = target_size
+        self.__reduction = reduction
         self.__transform_matrix = None  # This will be the transform matrix used later
+        self.__corners = None  # The corners of the board in the image
         self.__marker_names = []  # This holds the names of the markers eg A1, B2 etc
-        self.__image = None  # This will hold the processed image
+        self.__image = None  # This will hold the processed image, once it is asked for
+        self.__raw_image = None  # The last image processed, to make the processed image from
+        self.__markers = []  # The (x, y, radius) of the orientation markers in the warped image
+        self.__blockers = []  # The (x, y, radius) of the blockers in the warped image
+        self.__warped_size = (0, 0)  # The (width, height) of the warped image
+        self.__timings: t.Dict[str, float] = {}  # The seconds each stage of process took
 
     def get_image(self) -> np.array:
         """
-        Get the processed image.
+        Get the processed image, warped to a top down view of the board with the circles and their
+        names drawn on. It is only made the first time it is asked for after processing.
 
-        :return: The processed image.
+        :return: The processed image, or None if no image has been processed.
         """
+        if self.__image is None and self.__transform_matrix is not None:
+            if self.__raw_image is None:
+                self.__raw_image = self.__decode(cv2.IMREAD_COLOR)
+            self.__image = self.__draw_image()
         return deepcopy(self.__image)
 
     def get_marker_names(self) -> list[str]:
@@ -43,15 +115,236 @@ class ImageReader:
         """
         return self.__marker_names
 
+    def get_timings(self) -> t.Dict[str, float]:
+        """
+        Get the time each stage of process took: 'decode', 'detect' and 'warp'. Stages that
+        weren't reached are missing.
+
+        :return: The seconds each stage took.
+        """
+        return dict(self.__timings)
+
+    def get_transform_matrix(self) -> t.Optional[np.array]:
+        """
+        Get the perspective transform from the image to the warped image of the board.
+
+        :return: The 3x3 transform matrix, or None if no image has been processed.
+        """
+        return self.__transform_matrix
+
+    def get_board_corners(self) -> t.Optional[np.array]:
+        """
+        Get where the corners of the board, at the orientation markers, are in the image.
+
+        :return: The corners in pixels, as an array of shape (4, 2), or None if no image has been
+         processed.
+        """
+        return self.__corners
+
     def process(self) -> None:
         """
         This function processes the image to create a list of pieces in it.
         """
 
-        raw_image = cv2.imread(self.__path, cv2.IMREAD_COLOR)
+        self.__timings = {}
+        start_time = perf_counter()
+
+        raw_image = gray = None
+        reduction = 1 if self.__is_decoded() else self.__reduction
+        if reduction != 1:
+            gray = self.__decode(REDUCED_GRAYSCALE[reduction])
+
+            # The circles can't be found at the right size on an image smaller than the target
+            # size, so decode it again at the most reduction that is big enough, if any
+            if max(gray.shape) < self.__target_size:
+                full_size = max(gray.shape) * reduction
+                reduction = max((smaller for smaller in REDUCED_GRAYSCALE if smaller < reduction
+                                 and full_size // smaller >= self.__target_size), default=1)
+                gray = None if reduction == 1 else self.__decode(REDUCED_GRAYSCALE[reduction])
+        if gray is None:
+            raw_image = self.__decode(cv2.IMREAD_COLOR)
+        self.__timings['decode'] = perf_counter() - start_time
+
+        self.__process_image(raw_image, gray, reduction)
+
+    def __is_decoded(self) -> bool:
+        """
+        Get whether the source is an image that is already decoded.
+
+        :return: True if the source is a 2D or 3D array.
+        """
+        return isinstance(self.__source, np.ndarray) and self.__source.ndim > 1
+
+    def __decode(self, flags: int) -> np.array:
+        """
+        Decode the source image.
+
+        :param flags: The cv2.IMREAD_* flags to decode it with.
+        :return: The decoded image.
+        """
+
+        if self.__is_decoded():
+            return self.__source
+        if isinstance(self.__source, (str, os.PathLike)):
+            image = cv2.imread(os.fspath(self.__source), flags)
+            name = self.__source
+        else:
+            # frombuffer wraps the bytes as an array without copying them
+            image = cv2.imdecode(np.frombuffer(self.__source, dtype=np.uint8), flags)
+            name = "the given bytes"
+
+        if image is None:
+            raise ValueError(f"Could not read an image from {name}")
+        return image
+
+    def process_frame(self, frame: np.array,
+                      region: t.Optional[tuple[int, int, int, int]] = None) -> None:
+        """
+        Process an image that is already decoded, eg a video frame, instead of the source image.
+        Each call replaces the results of the last one.
+
+        :param frame: The BGR image.
+        :param region: The (x, y, width, height) of the part of the image to look for the board
+         in, eg where it was in the last frame, or None to look in all of it. The results are
+         still in pixels of the whole image.
+        """
+
+        self.__timings = {}
+        self.__process_image(frame, region=region)
+
+    def __process_image(self, raw_image: t.Optional[np.array],
+                        gray: t.Optional[np.array] = None, reduction: int = 1,
+                        region: t.Optional[tuple[int, int, int, int]] = None) -> None:
+        """
+        Find the blockers in a decoded image, and the transform to a top down view of the board.
+
+        :param raw_image: The BGR image, or None if only a reduced grayscale image was decoded.
+        :param gray: The grayscale image decoded at 1 / reduction of the size, or None to make it
+         from the BGR image.
+        :param reduction: The fraction of the size the grayscale image was decoded at.
+        :param region: The (x, y, width, height) of the part of the image to look in, in pixels of
+         the grayscale image, or None to look in all of it.
+        """
+
+        self.__marker_names = []
+        self.__image = None
+        self.__raw_image = None
+        self.__transform_matrix = None
+        self.__corners = None
+        start_time = perf_counter()
 
         # Convert to grayscale.
-        gray = cv2.cvtColor(raw_image, cv2.COLOR_BGR2GRAY)
+        if gray is None:
+            gray = raw_image if raw_image.ndim == 2 else cv2.cvtColor(raw_image,
+                                                                      cv2.COLOR_BGR2GRAY)
+        offset = np.zeros(3, dtype=np.uint16)
+        if region is not None:
+            x, y, width, height = region
+            gray = gray[y:y + height, x:x + width]
+            offset[:2] = x, y
+
+        if self.__target_size is None:
+            candidates = iter([self.__find_circles(gray)])
+        else:
+            candidates = self.__find_circles_downscaled(gray)
+
+        # Use the first circles found that make a board, looking again at another size if they
+        # don't
+        error = ValueError("There should be 7 blockers")
+        for blockers, orientation_markers in candidates:
+            read_time = perf_counter()
+            try:
+                # Move circles found in a region back to pixels of the whole image
+                if blockers is not None and orientation_markers is not None:
+                    blockers = blockers + offset
+                    orientation_markers = orientation_markers + offset
+                self.__read_board(blockers, orientation_markers, reduction)
+            except ValueError as read_error:
+                self.__transform_matrix = None
+                error = read_error
+                continue
+            self.__raw_image = raw_image
+            self.__timings['detect'] = read_time - start_time
+            self.__timings['warp'] = perf_counter() - read_time
+            return
+        raise error
+
+    def __read_board(self, blockers: t.Optional[np.array],
+                     orientation_markers: t.Optional[np.array], reduction: int) -> None:
+        """
+        Find the transform to a top down view of the board from the orientation markers, and the
+        names of the blockers on it. Nothing is set unless they make a board.
+
+        :param blockers: The blockers, as an array of shape (1, n, 3) holding (x, y, radius), or
+         None if none were found.
+        :param orientation_markers: The orientation markers, in the same form as the blockers.
+        :param reduction: The fraction of the size the circles were found at.
+        """
+
+        # Throw errors if the number of blockers or orientation markers is not correct
+        if blockers is None or len(blockers[0, :]) != 7:
+            raise ValueError("There should be 7 blockers")
+        if orientation_markers is None or len(orientation_markers[0, :]) != 3:
+            raise ValueError("There should be 3 orientation markers")
+
+        # Move the circles found on a reduced image back to full size pixels
+        if reduction != 1:
+            blockers = blockers * np.uint16(reduction)
+            orientation_markers = orientation_markers * np.uint16(reduction)
+
+        orientation_marker_radius = int(orientation_markers[0][0][2])
+
+        corner, ax_up, ax_right = self.__calculate_axes(orientation_markers)
+        up_length = np.linalg.norm(ax_up)
+        right_length = np.linalg.norm(ax_right)
+        if (min(up_length, right_length) < MARKER_SQUARENESS * max(up_length, right_length)
+                or abs(np.dot(ax_up, ax_right)) > MAX_MARKER_COSINE * up_length * right_length):
+            raise ValueError("The orientation markers are not at three corners of a square")
+
+        corners = np.array([corner, corner + ax_up, corner + ax_right, corner + ax_up + ax_right])
+        self.__calculate_transform(corners)
+
+        # Only the centres of the circles are moved into the warped image, the image itself is only
+        # warped if get_image is called
+        markers = self.__project_points(corners)
+        blockers = blockers[0, :]
+        blocker_centres = self.__project_points(blockers[:, :2])
+
+        # Get the max and min x & y values of the markers so we can find what square of the board
+        # a circle is in
+        x_range = (int(markers[:, 0].min()), int(markers[:, 0].max()))
+        y_range = (int(markers[:, 1].min()), int(markers[:, 1].max()))
+
+        # The centres of the outer squares are in from the markers by a fixed fraction of the board
+        x_inset = MARKER_INSET * (x_range[1] - x_range[0])
+        y_inset = MARKER_INSET * (y_range[1] - y_range[0])
+
+        # Calculate the names of the blockers
+        marker_names = []
+        for x, y in blocker_centres:
+            x_co = round(self.__remap(x_range[0] + x_inset, x_range[1] - x_inset, 1, 6, int(x)))
+            y_co = round(self.__remap(y_range[0] + y_inset, y_range[1] - y_inset, 0, 5, int(y)))
+            if not (1 <= x_co <= 6 and 0 <= y_co <= 5):
+                raise ValueError("A blocker is outside the board")
+            marker_names.append(f'{"ABCDEF"[y_co]}{x_co}')
+        if len(set(marker_names)) != len(marker_names):
+            raise ValueError("Two blockers are on the same square")
+
+        self.__marker_names = marker_names
+        self.__corners = corners.astype(np.float32)
+        self.__markers = [(int(x), int(y), orientation_marker_radius) for x, y in markers]
+        self.__blockers = [(int(x), int(y), int(pt[2]))
+                           for (x, y), pt in zip(blocker_centres, blockers)]
+
+    @staticmethod
+    def __find_circles(gray: np.array) -> tuple[t.Optional[np.array], t.Optional[np.array]]:
+        """
+        Find the blockers and orientation markers on the full size image, with one pass for each.
+
+        :param gray: The grayscale image.
+        :return: The blockers and the orientation markers, as arrays of shape (1, n, 3) holding
+         (x, y, radius) in pixels, or None if none were found.
+        """
 
         # Blur using 10 * 10 kernel.
         kernel_size = 10
@@ -66,64 +359,103 @@ class ImageReader:
                                                cv2.HOUGH_GRADIENT, 1, 100, param1=50,
                                                param2=40, minRadius=30, maxRadius=100)
 
-        blockers = np.uint16(np.around(blockers))
-        orientation_markers = np.uint16(np.around(orientation_markers))
-
-        # Throw errors if the number of blockers or orientation markers is not correct
-        if blockers is None or len(blockers[0, :]) != 7:
-            raise ValueError("There should be 7 blockers")
-        if orientation_markers is None or len(orientation_markers[0, :]) != 3:
-            raise ValueError("There should be 3 orientation markers")
+        if blockers is not None:
+            blockers = np.uint16(np.around(blockers))
+        if orientation_markers is not None:
+            orientation_markers = np.uint16(np.around(orientation_markers))
+        return blockers, orientation_markers
 
-        orientation_marker_radius = int(orientation_markers[0][0][2])
+    def __get_detection_levels(self, length: int) -> list[tuple[int, int]]:
+        """
+        Get the sizes to look for the circles at, in the order to try them. The board is first
+        taken to be target_size pixels long and to fill the image, then to fill less of it, as in
+        a widescreen video frame. Then the same is tried at smaller sizes, from no larger than
+        MAX_DETECTION_SIZE down to MIN_DETECTION_SIZE, and then at larger ones up to
+        MAX_DETECTION_SIZE.
+
+        :param length: The length of the longest side of the image.
+        :return: The length to shrink the longest side of the image to, and the length the board
+         is taken to be on it, for each size.
+        """
 
-        corner, ax_up, ax_right = self.__calculate_axes(orientation_markers)
+        board_sizes = [self.__target_size]
+        board_size = min(self.__target_size / np.sqrt(2), MAX_DETECTION_SIZE)
+        while board_size >= MIN_DETECTION_SIZE:
+            board_sizes.append(board_size)
+            board_size /= np.sqrt(2)
+        board_size = self.__target_size * np.sqrt(2)
+        while board_size <= MAX_DETECTION_SIZE:
+            board_sizes.append(board_size)
+            board_size *= np.sqrt(2)
+
+        levels = []
+        for board_size in board_sizes:
+            for fraction in BOARD_FRACTIONS:
+                image_size = min(length, round(board_size / fraction))
+                level = (image_size, round(min(board_size, image_size * fraction)))
+                if level not in levels:
+                    levels.append(level)
+        return levels
+
+    def __find_circles_downscaled(self, gray: np.array) -> t.Iterator[tuple[np.array, np.array]]:
+        """
+        Find the blockers and orientation markers in one pass on a shrunk copy of the image, and
+        scale them back to the full size image. The Hough transform's cost grows with the number of
+        pixels, so this is many times faster on phone photos. Each size from
+        __get_detection_levels is tried in turn, for as long as the circles found don't make a
+        board.
+
+        :param gray: The grayscale image.
+        :return: The blockers and the orientation markers found at each size they were found at, as
+         arrays of shape (1, n, 3) holding (x, y, radius) in full size pixels.
+        """
 
-        warped_image = self.__calculate_4_transform(raw_image, np.array(
-            [corner, corner + ax_up, corner + ax_right, corner + ax_up + ax_right]))
-
-        # warp orientation markers So they have new positions in the warped image
-        new_markers = []
-        for pt in [corner, corner + ax_up, corner + ax_right, corner + ax_up + ax_right]:
-            a, b, r = pt[0], pt[1], orientation_marker_radius
-            p = np.array([[a, ],
-                          [b],
-                          [1]])
-            p = np.matmul(self.__transform_matrix, p)
-            # get point name
-            cv2.circle(warped_image, (int(p[0, 0]), int(p[1, 0])), r, (0, 0, 255), 10)
-            new_markers.append((int(p[0, 0]), int(p[1, 0]), r))
-
-        # Get the max and min x & y values of the new markers so we can find what square of the
-        # board a circle is in
-        x_range = (min(new_markers, key=lambda x: x[0])[0], max(new_markers, key=lambda x: x[0])[0])
-        y_range = (min(new_markers, key=lambda x: x[1])[1], max(new_markers, key=lambda x: x[1])[1])
-
-        # Get the new positions of the blockers, draw them and calculate the names of the markers
-        for pt in blockers[0, :]:
-            a, b, r = pt[0], pt[1], pt[2]
-            p = np.array([[a, ],
-                          [b],
-                          [1]])
-            p = np.matmul(self.__transform_matrix, p)
-            # get point name
-
-            x_co = round(self.__remap(int(x_range[0]) + 200,
-                                      int(x_range[1]) - 200, 1, 6, int(p[0, 0])))
-            y_co = round(self.__remap(int(y_range[0]) + 200,
-                                      int(y_range[1]) - 200, 0, 5, int(p[1, 0])))
-            name = f'{"ABCDEF"[int(y_co)]}{x_co}'
-            self.__marker_names.append(name)
+        for image_size, board_size in self.__get_detection_levels(max(gray.shape)):
+            scale = image_size / max(gray.shape)
+            shrunk = gray if scale == 1 else cv2.resize(gray, None, fx=scale, fy=scale,
+                                                        interpolation=cv2.INTER_AREA)
+
+            # The sizes are fractions of the board rather than pixels, as the circles are the same
+            # part of the board whatever the resolution. The radii are loose as the circles are
+            # told apart by size afterwards.
+            kernel_size = max(1, round(0.004 * board_size))
+            gray_blurred = cv2.blur(shrunk, (kernel_size, kernel_size))
+
+            # HOUGH_GRADIENT_ALT's threshold is how circular a shape is rather than a number of
+            # votes, so it doesn't need changing with the scale.
+            circles = cv2.HoughCircles(gray_blurred, cv2.HOUGH_GRADIENT_ALT, 1, 0.05 * board_size,
+                                       param1=300, param2=0.7,
+                                       minRadius=max(1, round(0.005 * board_size)),
+                                       maxRadius=round(0.1 * board_size))
+            if circles is None or len(circles[0]) < 10:
+                continue
+
+            # The blockers are all the same size, so one much bigger or smaller isn't a blocker
+            blockers, orientation_markers = ImageReader.__classify_circles(circles[0] / scale)
+            if blockers[:, 2].max() > MAX_BLOCKER_SPREAD * blockers[:, 2].min():
+                continue
+            yield (np.uint16(np.around(blockers))[None],
+                   np.uint16(np.around(orientation_markers))[None])
 
-            # draw the blocker
-            cv2.circle(warped_image, (int(p[0,0]), int(p[1,0])), r, (255, 0, 0), 5)
+    @staticmethod
+    def __classify_circles(circles: np.array) -> tuple[np.array, np.array]:
+        """
+        Split circles into blockers and orientation markers by their radius. The orientation
+        markers are much smaller, so the split is at the biggest jump in size between circles that
+        leaves at least 7 blockers and 3 orientation markers. If there are too many of either,
+        only the strongest are kept.
+
+        :param circles: The circles, as an array of shape (n, 3) holding (x, y, radius), with the
+         strongest first. There must be at least 10.
+        :return: The blockers and the orientation markers, each of shape (m, 3).
+        """
 
-            # Draw a small circle (of radius 1) to show the center.
-            cv2.circle(warped_image, (int(p[0,0]), int(p[1,0])), 1, (255, 0, 0), 10)
-            cv2.putText(warped_image, name, (int(p[0,0]) - 20, int(p[1,0])), cv2.FONT_ITALIC,
-                        2, (0, 0, 255), 3, cv2.LINE_AA)
+        radii = np.sort(circles[:, 2])
+        ratios = radii[3:len(radii) - 6] / np.maximum(radii[2:len(radii) - 7], 1)
+        split_radius = radii[int(np.argmax(ratios)) + 3]
 
-        self.__image = warped_image
+        is_blocker = circles[:, 2] >= split_radius
+        return circles[is_blocker][:7], circles[~is_blocker][:3]
 
     @staticmethod
     def __calculate_axes(orientation_markers: np.array) -> tuple[np.array, np.array, np.array]:
@@ -186,15 +518,14 @@ class ImageReader:
         # return the ordered coordinates
         return rect
 
-    def __calculate_4_transform(self, image, pts):
+    def __calculate_transform(self, pts: np.array) -> None:
         """
-        This function transforms an image so the 4 pts are in the corners
-        It also sets the transform matrix for later use.
+        This function calculates the transform that moves the 4 pts to the corners of the warped
+        image, and sets the transform matrix and the size of the warped image for later use.
         NB: This code is from pyimagesearch.com
 
-        :param image: the image to warp
         :param pts: The 4 points to warp to
-        :return: The warped image
+        :return: None
         """
         # obtain a consistent order of the points and unpack them
         # individually
@@ -223,11 +554,42 @@ class ImageReader:
             [max_width - 1, max_height - 1],
             [0, max_height - 1]], dtype="float32")
         # compute the perspective transform matrix and then apply it
-        matrix = cv2.getPerspectiveTransform(rect, dst)
-        self.__transform_matrix = matrix
-        warped = cv2.warpPerspective(image, matrix, (max_width, max_height))
-        # return the warped image
-        return warped
+        self.__transform_matrix = cv2.getPerspectiveTransform(rect, dst)
+        self.__warped_size = (max_width, max_height)
+
+    def __project_points(self, pts: np.array) -> np.array:
+        """
+        Move points in the image to where they are in the warped image.
+
+        :param pts: The points, as an array of shape (n, 2).
+        :return: The moved points, as an array of shape (n, 2).
+        """
+        pts = np.asarray(pts, dtype=np.float32).reshape(-1, 1, 2)
+        return cv2.perspectiveTransform(pts, self.__transform_matrix).reshape(-1, 2)
+
+    def __draw_image(self) -> np.array:
+        """
+        Warp the last image processed to a top down view of the board, and draw the orientation
+        markers, the blockers and their names on it.
+
+        :return: The processed image.
+        """
+        warped_image = cv2.warpPerspective(self.__raw_image, self.__transform_matrix,
+                                           self.__warped_size)
+
+        for x, y, r in self.__markers:
+            cv2.circle(warped_image, (x, y), r, (0, 0, 255), 10)
+
+        for (x, y, r), name in zip(self.__blockers, self.__marker_names):
+            # draw the blocker
+            cv2.circle(warped_image, (x, y), r, (255, 0, 0), 5)
+
+            # Draw a small circle (of radius 1) to show the center.
+            cv2.circle(warped_image, (x, y), 1, (255, 0, 0), 10)
+            cv2.putText(warped_image, name, (x - 20, y), cv2.FONT_ITALIC,
+                        2, (0, 0, 255), 3, cv2.LINE_AA)
+
+        return warped_image
 
     @staticmethod
     def __remap(in_min: float, in_max: float, out_min: float, out_max: float, v: float) -> float:
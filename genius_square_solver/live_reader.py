@@ -0,0 +1,260 @@
+"""
+This is the code file for the live mode of the Genius Square Solver project.
+
+It reads frames from a webcam or a video file, finds the blockers again only when the board has
+moved, looking first where the board was before, and solves each set of blockers once, eg:
+    python live_reader.py 0 --show
+    python live_reader.py board.mp4
+"""
+
+# pylint: disable=E1101, R0902, W0718
+
+import argparse
+import typing as t
+from functools import lru_cache
+from time import perf_counter
+import cv2
+import numpy as np
+
+from board import Board
+from dice import letter_coord_to_index
+from image_processor import DEFAULT_TARGET_SIZE, ImageReader
+
+# The width of the thumbnail of each frame that is compared to notice movement.
+THUMBNAIL_WIDTH = 64
+
+# How far past the corners of the board found by the last search to look for it first, as a
+# fraction of the size of the board. This covers the orientation markers and small moves.
+TRACKING_MARGIN = 0.25
+
+
+class FrameResult(t.NamedTuple):
+    """
+    The result of reading one frame.
+    """
+
+    index: int  # the index of the frame in the video
+    frame: np.ndarray  # the BGR frame
+    detected: bool  # whether the blockers were searched for on this frame
+    blockers: t.Optional[tuple[str, ...]]  # the sorted blocker names, or None if not found
+    solution: t.Optional[np.ndarray]  # the read only 6x6 space of the solution, or None
+    corners: t.Optional[np.ndarray]  # the (4, 2) corners of the board in the frame, or None
+
+
+@lru_cache(maxsize=1024)
+def solve_blockers(blockers: tuple[str, ...]) -> t.Optional[np.ndarray]:
+    """
+    Solve a set of blockers, remembering the solution for when it is seen again.
+
+    :param blockers: The sorted blocker names, eg ('A1', 'B3', ...).
+    :return: The read only 6x6 space of the first solution, or None if there isn't one.
+    """
+
+    board = Board([letter_coord_to_index(name) for name in blockers], limit=1)
+    if not board.solve():
+        return None
+
+    space = board.get_space()
+    space.setflags(write=False)
+    return space
+
+
+class LiveReader:
+    """
+    This class reads the board from a stream of frames. Finding the circles is by far the slowest
+    step, so it is only done when a small thumbnail of the frame shows the board has moved since
+    the last search and has then stopped moving. Each search looks first around where the
+    perspective transform of the last search put the board, and only then in the whole frame.
+    Between searches, the blockers, solution and board corners of the last search are reused.
+    """
+
+    def __init__(self, target_size: t.Optional[int] = DEFAULT_TARGET_SIZE,
+                 motion_threshold: float = 4.0, retry_interval: int = 15) -> None:
+        """
+        Constructor to set up the reader.
+
+        :param target_size: The target size to pass to ImageReader.
+        :param motion_threshold: The mean difference in grey level between thumbnails, out of 255,
+         above which the board counts as moved.
+        :param retry_interval: The number of frames to wait before searching again when the
+         board wasn't found, even if nothing moved.
+        :return: None
+        """
+
+        self.__reader = ImageReader('', target_size)
+        self.__motion_threshold = motion_threshold
+        self.__retry_interval = retry_interval
+
+        self.__index = 0
+        self.__reference: t.Optional[np.ndarray] = None  # the thumbnail of the last search
+        self.__previous: t.Optional[np.ndarray] = None  # the thumbnail of the last frame
+        self.__last_search = 0
+        self.__blockers: t.Optional[tuple[str, ...]] = None
+        self.__corners: t.Optional[np.ndarray] = None
+
+    def get_reader(self) -> ImageReader:
+        """
+        Get the image reader of the last search, to get its warped image or transform matrix.
+
+        :return: The image reader.
+        """
+
+        return self.__reader
+
+    def read(self, source: t.Union[int, str]) -> t.Iterator[FrameResult]:
+        """
+        Read every frame from a video source.
+
+        :param source: The index of a camera, or the path of a video file.
+        :return: An iterator of the result of each frame.
+        """
+
+        capture = cv2.VideoCapture(source)
+        if not capture.isOpened():
+            raise ValueError(f"Could not open video source {source}")
+
+        try:
+            while True:
+                read, frame = capture.read()
+                if not read:
+                    break
+                yield self.process_frame(frame)
+        finally:
+            capture.release()
+
+    def process_frame(self, frame: np.ndarray) -> FrameResult:
+        """
+        Read the board from the next frame.
+
+        :param frame: The BGR frame.
+        :return: The result of the frame.
+        """
+
+        height, width = frame.shape[:2]
+        thumbnail = cv2.cvtColor(cv2.resize(frame, (THUMBNAIL_WIDTH,
+                                                    max(1, THUMBNAIL_WIDTH * height // width)),
+                                            interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+
+        detected = self.__should_search(thumbnail)
+        if detected:
+            self.__reference = thumbnail
+            self.__last_search = self.__index
+            self.__search(frame)
+
+        self.__previous = thumbnail
+        result = FrameResult(self.__index, frame, detected, self.__blockers,
+                             solve_blockers(self.__blockers) if self.__blockers else None,
+                             self.__corners)
+        self.__index += 1
+        return result
+
+    def __search(self, frame: np.ndarray) -> None:
+        """
+        Search a frame for the board, first around where it was last found, then in the whole
+        frame. A frame the board can't be read from, for any reason, only loses that frame.
+
+        :param frame: The BGR frame.
+        :return: None
+        """
+
+        regions = [None]
+        if self.__corners is not None:
+            regions.insert(0, self.__get_tracked_region(frame.shape))
+
+        self.__blockers = self.__corners = None
+        for region in regions:
+            try:
+                self.__reader.process_frame(frame, region)
+            except Exception:
+                continue
+            self.__blockers = tuple(sorted(self.__reader.get_marker_names()))
+            self.__corners = self.__reader.get_board_corners()
+            return
+
+    def __get_tracked_region(self, shape: tuple[int, ...]) -> tuple[int, int, int, int]:
+        """
+        Get the part of a frame around the board found by the last search.
+
+        :param shape: The shape of the frame.
+        :return: The (x, y, width, height) of the region.
+        """
+
+        x, y, width, height = cv2.boundingRect(self.__corners)
+        margin_x = round(TRACKING_MARGIN * width)
+        margin_y = round(TRACKING_MARGIN * height)
+        left = max(0, x - margin_x)
+        top = max(0, y - margin_y)
+        right = min(shape[1], x + width + margin_x)
+        bottom = min(shape[0], y + height + margin_y)
+        return left, top, right - left, bottom - top
+
+    def __should_search(self, thumbnail: np.ndarray) -> bool:
+        """
+        Decide whether to search a frame for the board.
+
+        :param thumbnail: The thumbnail of the frame.
+        :return: True to search the frame.
+        """
+
+        if self.__reference is None or self.__reference.shape != thumbnail.shape:
+            return True
+        if self.__blockers is None and self.__index - self.__last_search >= self.__retry_interval:
+            return True
+
+        # Only search once the board has moved since the last search and then settled
+        moved = cv2.absdiff(thumbnail, self.__reference).mean() > self.__motion_threshold
+        settled = cv2.absdiff(thumbnail, self.__previous).mean() <= self.__motion_threshold
+        return moved and settled
+
+
+def main() -> None:
+    """
+    The main function to read and solve the board from a camera or video file.
+
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description="Solve Genius Square from a camera or video.")
+    parser.add_argument('source', help="the index of a camera, or the path of a video file")
+    parser.add_argument('--show', action='store_true', help="show the frames and the board")
+    parser.add_argument('--target-size', type=int, default=DEFAULT_TARGET_SIZE,
+                        help="the size to shrink frames to before finding circles, or 0 for none")
+    parser.add_argument('--motion-threshold', type=float, default=4.0,
+                        help="the mean grey level difference that counts as the board moving")
+    args = parser.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    live_reader = LiveReader(args.target_size or None, args.motion_threshold)
+
+    blockers = None
+    frames = searches = 0
+    start_time = perf_counter()
+    for frame in live_reader.read(source):
+        frames += 1
+        searches += frame.detected
+        if frame.blockers != blockers:
+            blockers = frame.blockers
+            found = ', '.join(blockers) if blockers else 'not found'
+            print(f"Frame {frame.index}: blockers {found}")
+            if frame.solution is not None:
+                print(frame.solution)
+
+        if args.show:
+            if frame.detected and frame.blockers is not None:
+                cv2.imshow("Board", live_reader.get_reader().get_image())
+            # Outline the board found by the last search on every frame, without warping them
+            if frame.corners is not None:
+                outline = np.int32(frame.corners[[0, 1, 3, 2]])
+                cv2.polylines(frame.frame, [outline], True, (0, 255, 0), 2)
+            cv2.imshow("Frame", frame.frame)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+
+    elapsed = perf_counter() - start_time
+    print(f"Read {frames} frames at {frames / elapsed:.0f} fps, searched {searches} of them")
+    if args.show:
+        cv2.destroyAllWindows()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+This module contains the code shared by the precomputed files that are read through a memory map,
+the solution database and the hardness index.
+
+Each file is a header holding a 4-byte magic, a version and a record count, followed by that many
+fixed-width records.
+"""
+
+import mmap
+import os
+import struct
+import typing as t
+
+HEADER = struct.Struct('<4sHI')  # magic, version, record count
+
+T = t.TypeVar('T')
+
+
+def write_header(file: t.BinaryIO, magic: bytes, version: int, count: int) -> None:
+    """
+    Write the header of a file.
+
+    :param file: The file to write to, at its start.
+    :param magic: The 4-byte magic of the file type.
+    :param version: The version of the file type.
+    :param count: The number of records that follow.
+    :return: None
+    """
+
+    file.write(HEADER.pack(magic, version, count))
+
+
+def map_records(path: str, magic: bytes, version: int, record_size: int,
+                description: str) -> tuple[mmap.mmap, int]:
+    """
+    Map a file read-only and check its header and size.
+
+    :param path: The path to the file.
+    :param magic: The 4-byte magic of the file type.
+    :param version: The version of the file type.
+    :param record_size: The size of each record in bytes.
+    :param description: The name of the file type for errors, eg 'solution database'.
+    :return: The memory map and the number of records. The records start at HEADER.size.
+    """
+
+    with open(path, 'rb') as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    found_magic, found_version, count = HEADER.unpack_from(data.read(HEADER.size)
+                                                           .ljust(HEADER.size))
+    if found_magic != magic or found_version != version:
+        data.close()
+        raise ValueError(f"{path} is not a version {version} {description}")
+    if len(data) != HEADER.size + count * record_size:
+        data.close()
+        raise ValueError(f"{path} is truncated")
+
+    return data, count
+
+
+class DefaultFile(t.Generic[T]):  # pylint: disable=R0903
+    """
+    This class holds the file at a default path, which is opened only the first time it is asked
+    for, and only if it has been built.
+    """
+
+    def __init__(self, path: str, open_file: t.Callable[[str], T]) -> None:
+        """
+        Constructor to set up the default file, without opening it.
+
+        :param path: The default path of the file.
+        :param open_file: The function to open the file with, eg the class that reads it.
+        :return: None
+        """
+
+        self.__path = path
+        self.__open_file = open_file
+        self.__file: t.Optional[T] = None
+        self.__loaded = False
+
+    def get(self) -> t.Optional[T]:
+        """
+        Get the file, opening it the first time.
+
+        :return: The opened file, or None if it has not been built.
+        """
+
+        if not self.__loaded:
+            if os.path.exists(self.__path):
+                self.__file = self.__open_file(self.__path)
+            self.__loaded = True
+        return self.__file
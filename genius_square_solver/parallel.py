@@ -0,0 +1,161 @@
+"""
+This module contains the parallel solver engine, which splits the bitboard search of one board
+across a pool of worker processes.
+"""
+
+# pylint: disable=R0902,R0913,R0917
+
+import typing as t
+from multiprocessing import Event, Pool
+from time import time
+from bitboard import BitboardSolver, SearchState
+from placements import Placement, PlacementTable
+from search_limit import CANCELLED, FINISHED, TIMED_OUT, CancelToken
+
+# The state of each worker process, its 'table', 'blockers' and 'cancel' event, set up by
+# _init_worker.
+_worker: t.Dict[str, t.Any] = {}
+
+
+def _init_worker(table: PlacementTable, blockers: t.List[t.Any], cancel) -> None:
+    """
+    Set up a worker process with the board to solve.
+
+    :param table: The placement table of the pieces to place.
+    :param blockers: A list of the blocker positions to use.
+    :param cancel: The event that is set when the search should stop.
+    :return: None
+    """
+
+    _worker.update(table=table, blockers=blockers, cancel=cancel)
+
+
+def _solve_part(job: tuple[SearchState, float, t.Optional[int]]
+                ) -> tuple[t.List[t.List[Placement]], int]:
+    """
+    Search one part of the board in a worker process.
+
+    :param job: The (state to search from, deadline, solution limit) to search.
+    :return: The solutions found in this part, and the number of nodes expanded.
+    """
+
+    state, deadline, limit = job
+    solutions: t.List[t.List[Placement]] = []
+
+    # another part may have already found enough solutions
+    if _worker['cancel'].is_set() or time() > deadline:
+        return solutions, 0
+
+    solver = BitboardSolver(_worker['table'], _worker['blockers'], deadline - time())
+    for solution in solver.iter_solutions(state):
+        solutions.append(solution)
+        if (limit is not None and len(solutions) >= limit) or _worker['cancel'].is_set():
+            break
+    return solutions, solver.get_node_count()
+
+
+class ParallelSolver:
+    """
+    This class solves a board by splitting the first placements of the bitboard search into
+    independent parts, and searching the parts on a pool of processes. There are many more parts
+    than processes, so the work is shared out as processes finish their parts. Solutions are
+    yielded in the order they are found, so the order can change between runs.
+    """
+
+    def __init__(self, table: PlacementTable, blockers: t.List[t.Any], time_limit: float = 20,
+                 processes: t.Optional[int] = None, split_depth: int = 2,
+                 cancel: t.Optional[CancelToken] = None) -> None:
+        """
+        Constructor to set up the solver.
+
+        :param table: The placement table of the pieces to place.
+        :param blockers: A list of the blocker positions to use.
+        :param time_limit: The maximum number of seconds to search for.
+        :param processes: The number of worker processes, or None for one per CPU.
+        :param split_depth: The number of placements to make to split the search into parts.
+        :param cancel: A token to cancel the search with from another thread, or None. It is
+         checked each time a part finishes.
+        :return: None
+        """
+
+        self.__table = table
+        self.__blockers = blockers
+        self.__time_limit = time_limit
+        self.__processes = processes
+        self.__split_depth = split_depth
+        self.__cancel = cancel
+        self.__status = FINISHED
+        self.__nodes = 0
+
+    def solve(self, limit: t.Optional[int]) -> t.List[t.List[Placement]]:
+        """
+        Solve the board.
+
+        :param limit: The maximum number of solutions to find, or None to find every solution.
+        :return: A list of solutions, each a list of placements.
+        """
+
+        solutions = []
+        for solution in self.iter_solutions(limit):
+            solutions.append(solution)
+            if limit is not None and len(solutions) >= limit:
+                break
+        return solutions
+
+    def get_status(self) -> str:
+        """
+        Get whether the last search finished or what stopped it.
+
+        :return: The status, one of the statuses in search_limit.
+        """
+
+        return self.__status
+
+    def get_node_count(self) -> int:
+        """
+        Get the number of nodes the workers expanded in the last search, in the parts that have
+        finished.
+
+        :return: The number of nodes.
+        """
+
+        return self.__nodes
+
+    def iter_solutions(self, limit: t.Optional[int] = None) -> t.Iterator[t.List[Placement]]:
+        """
+        Lazily find the solutions of the board, yielding them as the parts finish. The workers
+        are told to stop as soon as the caller stops iterating. The time limit counts from when
+        iteration starts.
+
+        :param limit: The most solutions the caller needs, so no part searches for more than this.
+        :return: An iterator of solutions, each a list of placements.
+        """
+
+        deadline = time() + self.__time_limit
+        self.__status = FINISHED
+        self.__nodes = 0
+        if self.__cancel is not None and self.__cancel.is_cancelled():
+            self.__status = CANCELLED
+            return
+        parts = BitboardSolver(self.__table, self.__blockers).split(self.__split_depth)
+
+        cancel = Event()
+        with Pool(self.__processes, initializer=_init_worker,
+                  initargs=(self.__table, self.__blockers, cancel)) as pool:
+            try:
+                jobs = ((part, deadline, limit) for part in parts)
+                for solutions, nodes in pool.imap_unordered(_solve_part, jobs):
+                    self.__nodes += nodes
+                    if self.__cancel is not None and self.__cancel.is_cancelled():
+                        self.__status = CANCELLED
+                        return
+                    yield from solutions
+
+                # parts that started after the deadline weren't searched
+                if time() > deadline:
+                    self.__status = TIMED_OUT
+            finally:
+                # tell the workers to stop, then stop any that are part way through a search
+                cancel.set()
+                pool.terminate()
+                pool.join()
@@ -10,9 +10,12 @@ import numpy as np
 
 class Piece:
     """
-    This represents a piece on the board.
+    This represents a piece on the board. Pieces are immutable, and the pieces of the game are
+    created once in PIECES and shared by every board.
     """
 
+    __slots__ = ('__text_color', '__gui_colour', '__masks', '__name', '__uuid')
+
     def __init__(self, uuid: int, name: str, text_color: str, gui_colour: t.List[float],
                  default_mask: t.List[t.List[bool]]) -> None:
         """
@@ -26,8 +29,8 @@ class Piece:
         eg [[True, False], [True, True]] is a 90deg corner.
         """
         self.__text_color: str = text_color
-        self.__gui_colour = gui_colour
-        self.__masks = []
+        self.__gui_colour = tuple(gui_colour)
+        self.__masks: t.Tuple[np.ndarray, ...] = ()
         self.__name = name
         self.__uuid = uuid
 
@@ -35,10 +38,11 @@ class Piece:
             for rotation in [0, 1, 2, 3]:
                 new_mask = np.array(default_mask)
                 new_mask = np.fliplr(new_mask) if flip else new_mask
-                new_mask = np.rot90(new_mask, rotation)
+                new_mask = np.ascontiguousarray(np.rot90(new_mask, rotation))
 
                 if not self.mask_exists(new_mask):
-                    self.__masks.append(new_mask)
+                    new_mask.setflags(write=False)
+                    self.__masks += (new_mask,)
 
     def mask_exists(self, new_mask):
         """
@@ -51,9 +55,9 @@ class Piece:
 
         return any(np.array_equal(new_mask, m) for m in self.__masks)
 
-    def get_masks(self):
+    def get_masks(self) -> t.Tuple[np.ndarray, ...]:
         """
-        Get the masks for the piece.
+        Get the masks for the piece. These are read only.
 
         :return: The masks for the piece.
         """
@@ -90,3 +94,52 @@ class Piece:
         :return: Return a string representation of the piece
         """
         return f"Board piece - Name:{self.__name}, UUID:{self.__uuid}, Colour:{self.__gui_colour}"
+
+
+def _create_pieces() -> t.Tuple[Piece, ...]:
+    """
+    Create the pieces of the game.
+
+    :return: The blocker, then the pieces to place.
+    """
+
+    blocker = Piece(1,'Blocker',
+                        "\u001b[38;5;94m", [0.6, 0.4, 0.05],
+                        [[True]])
+    blue = (Piece(2,'Blue',
+                        "\u001b[38;5;21m", [0, 0, 1.0],
+                        [[True]]))
+    brown = (Piece(3,'Brown',
+                        "\u001b[38;5;52m", [0.5, 0.3, 0.3],
+                        [[True, True]]))
+    orange = (Piece(4,'Orange',
+                        "\u001b[38;5;208m", [1.0, 0.4, 0],
+                        [[True, True, True]]))
+    grey = (Piece(5,'Grey',
+                        "\u001b[38;5;248m", [0.5, 0.5, 0.5],
+                        [[True, True, True, True]]))
+    red =(Piece(6,'Red',
+                        "\u001b[38;5;1m", [1.0, 0, 0],
+                        [[False, True, True], [True, True, False]]))
+    yellow = (Piece(7,'Yellow',
+                        "\u001b[38;5;11m", [1.0, 0.7, 0],
+                        [[True, True, True],
+                         [False, True, False]]))
+    cyan = (Piece(8,'Cyan',
+                        "\u001b[38;5;45m", [0.2, 0.5, 1.0],
+                        [[True, True, True], [True, False, False]]))
+    green = (Piece(9,'Green',
+                        "\u001b[38;5;22m", [0, 1.0, 0],
+                        [[True, True], [True, True]]))
+    purple = (Piece(10,'Purple',
+                        "\u001b[38;5;54m", [0.5, 0, 0.5],
+                        [[True, True], [True, False]]))
+
+#  pieces = {Blocker,Grey,Red,Yellow,Cyan,Orange,Green,Purple,Brown,Blue};
+#         pieces = [blocker, blue, brown, orange, grey, red, yellow, cyan, green, purple]
+    return (blocker,grey,red,yellow,cyan,orange,green,purple,brown,blue)
+
+
+# The pieces of the game, shared by every board. The blocker is first, then the pieces to place
+# in the order they are searched.
+PIECES = _create_pieces()
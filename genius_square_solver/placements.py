@@ -0,0 +1,144 @@
+"""
+This module contains the placement table, which lists every legal placement of a set of pieces.
+"""
+
+import typing as t
+from piece import Piece
+
+BOARD_SIZE = 6
+
+
+def cell_bit(row: int, col: int) -> int:
+    """
+    Get the bit for a single square of the board.
+
+    :param row: The row of the square.
+    :param col: The column of the square.
+    :return: The bit for that square.
+    """
+
+    return 1 << (row * BOARD_SIZE + col)
+
+
+def piece_mask_to_bits(row: int, col: int, piece_mask) -> t.Optional[int]:
+    """
+    Convert a piece mask placed with its top-left at (row, col) into a board bitmask.
+
+    :param row: The row of the top-left of the piece mask.
+    :param col: The column of the top-left of the piece mask.
+    :param piece_mask: The 2D boolean mask of the piece.
+    :return: The bitmask of the covered squares, or None if the piece goes off the board.
+    """
+
+    piece_rows, piece_cols = piece_mask.shape
+    if row + piece_rows > BOARD_SIZE or col + piece_cols > BOARD_SIZE:
+        return None
+
+    bits = 0
+    for mask_row in range(piece_rows):
+        for mask_col in range(piece_cols):
+            if piece_mask[mask_row, mask_col]:
+                bits |= cell_bit(row + mask_row, col + mask_col)
+    return bits
+
+
+class Placement(t.NamedTuple):
+    """
+    A single placement of a piece on an empty board.
+    """
+
+    piece: int  # index of the piece in the table's piece list
+    row: int
+    col: int
+    orientation: int
+    bits: int  # bitmask of the squares covered
+
+
+class PlacementTable:
+    """
+    This class holds every legal placement of a set of pieces on an empty board.
+
+    Placements are listed per piece, and indexed by the squares they cover, so a search never has
+    to try placements that go off the board or that do not cover the square it is filling.
+    """
+
+    def __init__(self, pieces: t.List[Piece]) -> None:
+        """
+        Constructor to build the placement table.
+
+        :param pieces: The pieces to build placements for.
+        :return: None
+        """
+
+        self.__pieces = pieces
+        self.__placements: t.List[t.List[Placement]] = []
+        self.__covering: t.List[t.List[t.List[Placement]]] = []
+
+        for piece_index, piece in enumerate(pieces):
+            placements = []
+            covering: t.List[t.List[Placement]] = [[] for _ in range(BOARD_SIZE * BOARD_SIZE)]
+
+            for origin in range(BOARD_SIZE * BOARD_SIZE):
+                row, col = divmod(origin, BOARD_SIZE)
+                for orientation, piece_mask in enumerate(piece.get_masks()):
+                    bits = piece_mask_to_bits(row, col, piece_mask)
+                    if bits is None:
+                        continue  # goes off the board
+
+                    placement = Placement(piece_index, row, col, orientation, bits)
+                    placements.append(placement)
+                    for cell in range(BOARD_SIZE * BOARD_SIZE):
+                        if bits >> cell & 1:
+                            covering[cell].append(placement)
+
+            self.__placements.append(placements)
+            self.__covering.append(covering)
+
+    def get_pieces(self) -> t.List[Piece]:
+        """
+        Get the pieces in the table.
+
+        :return: The pieces in the table.
+        """
+
+        return self.__pieces
+
+    def get_placements(self, piece_index: int) -> t.List[Placement]:
+        """
+        Get every legal placement of a piece on an empty board.
+
+        :param piece_index: The index of the piece.
+        :return: The placements, ordered by row, column then orientation.
+        """
+
+        return self.__placements[piece_index]
+
+    def get_covering(self, piece_index: int, cell: int) -> t.List[Placement]:
+        """
+        Get every legal placement of a piece that covers a square.
+
+        :param piece_index: The index of the piece.
+        :param cell: The square to cover, as row * 6 + col.
+        :return: The placements that cover the square.
+        """
+
+        return self.__covering[piece_index][cell]
+
+
+_placement_tables: t.Dict[tuple, PlacementTable] = {}
+
+
+def get_placement_table(pieces: t.List[Piece]) -> PlacementTable:
+    """
+    Get the placement table for a set of pieces, building it only the first time it is asked for.
+
+    :param pieces: The pieces to get the table for.
+    :return: The placement table.
+    """
+
+    key = tuple((piece.get_uuid(), tuple(mask.tobytes() + bytes(mask.shape)
+                                         for mask in piece.get_masks()))
+                for piece in pieces)
+    if key not in _placement_tables:
+        _placement_tables[key] = PlacementTable(pieces)
+    return _placement_tables[key]
@@ -0,0 +1,176 @@
+"""
+This module contains the limits that stop a search early: a time limit, a node budget and a cancel
+token, and the status a search ends with.
+
+Checking the clock at every node costs more than the node itself, so the limits count the nodes of
+the search and are only checked every check_interval nodes.
+"""
+
+# pylint: disable=R0902
+
+import typing as t
+from threading import Event
+from time import time
+
+# The status of a search.
+FINISHED = 'finished'  # searched to the end, or stopped by the caller or the solution limit
+TIMED_OUT = 'timed_out'
+OUT_OF_NODES = 'out_of_nodes'
+CANCELLED = 'cancelled'
+
+# The default number of nodes between checks of the limits.
+DEFAULT_CHECK_INTERVAL = 256
+
+
+class CancelToken:
+    """
+    This class is a flag that can be set from another thread to cancel a search.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor to set up the token, not cancelled.
+
+        :return: None
+        """
+
+        self.__event = Event()
+
+    def cancel(self) -> None:
+        """
+        Cancel every search that uses this token.
+
+        :return: None
+        """
+
+        self.__event.set()
+
+    def is_cancelled(self) -> bool:
+        """
+        Get whether the token has been cancelled.
+
+        :return: True if cancelled.
+        """
+
+        return self.__event.is_set()
+
+
+class SearchLimit:
+    """
+    This class checks whether a search should stop. The solver calls count_node at every node,
+    which calls check when the node count reaches the count the last check returned.
+    """
+
+    def __init__(self, time_limit: float, max_nodes: t.Optional[int] = None,
+                 cancel: t.Optional[CancelToken] = None,
+                 check_interval: int = DEFAULT_CHECK_INTERVAL) -> None:
+        """
+        Constructor to set up the limits.
+
+        :param time_limit: The maximum number of seconds to search for.
+        :param max_nodes: The maximum number of nodes to expand, or None for no limit.
+        :param cancel: A token to cancel the search with, or None.
+        :param check_interval: The number of nodes between checks of the time and cancel token.
+        :return: None
+        """
+
+        # error checking
+        if check_interval < 1:
+            raise ValueError("Check interval must be at least 1")
+
+        self.__time_limit = time_limit
+        self.__max_nodes = max_nodes
+        self.__cancel = cancel
+        self.__check_interval = check_interval
+        self.__deadline = 0.0
+        self.__status = FINISHED
+        self.__nodes = 0
+        self.__next_check = 0
+
+    def start(self) -> int:
+        """
+        Start a search, with the time limit counting from now. The limits are checked straight
+        away, so a search that is already cancelled or out of time stops at its first node.
+
+        :return: The node count to first check at, or -1 if the search should stop.
+        """
+
+        self.__deadline = time() + self.__time_limit
+        self.__status = FINISHED
+        self.__nodes = 0
+        self.__next_check = self.check(0)
+        return self.__next_check
+
+    def count_node(self) -> bool:
+        """
+        Count a node of the search, and every check_interval nodes check whether it should stop.
+
+        :return: True if the search should stop.
+        """
+
+        self.__nodes += 1
+        if self.__nodes < self.__next_check:
+            return False
+        self.__next_check = self.check(self.__nodes)
+        return self.__next_check < 0
+
+    def get_nodes(self) -> int:
+        """
+        Get the number of nodes counted since the search started.
+
+        :return: The number of nodes.
+        """
+
+        return self.__nodes
+
+    def check(self, nodes: int) -> int:
+        """
+        Check whether the search should stop.
+
+        :param nodes: The number of nodes expanded so far.
+        :return: The node count to check at next, or -1 if the search should stop. Once it has
+         returned -1, it always does until the search is started again.
+        """
+
+        if self.__status == FINISHED:
+            if self.__cancel is not None and self.__cancel.is_cancelled():
+                self.__status = CANCELLED
+            elif self.__max_nodes is not None and nodes > self.__max_nodes:
+                self.__status = OUT_OF_NODES
+            elif time() > self.__deadline:
+                self.__status = TIMED_OUT
+
+        if self.__status != FINISHED:
+            return -1
+        return self.__get_next_check(nodes)
+
+    def __get_next_check(self, nodes: int) -> int:
+        """
+        Get the node count to check at next.
+
+        :param nodes: The number of nodes expanded so far.
+        :return: The node count, which is never past the node budget.
+        """
+
+        next_check = nodes + self.__check_interval
+        if self.__max_nodes is not None:
+            next_check = min(next_check, self.__max_nodes + 1)
+        return next_check
+
+    def get_status(self) -> str:
+        """
+        Get the status of the search, FINISHED unless a limit stopped it.
+
+        :return: The status, one of FINISHED, TIMED_OUT, OUT_OF_NODES or CANCELLED.
+        """
+
+        return self.__status
+
+    def is_stopped(self) -> bool:
+        """
+        Get whether a limit stopped the search.
+
+        :return: True if the search was stopped.
+        """
+
+        return self.__status != FINISHED
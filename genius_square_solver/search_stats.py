@@ -0,0 +1,231 @@
+"""
+This module contains the search stats class, which collects counts from the bitboard search to
+see why a board is slow to solve.
+"""
+
+# pylint: disable=R0902
+
+import typing as t
+from time import time
+
+
+class SearchStats:
+    """
+    This class collects the counts of one or more bitboard searches. Pass it to BitboardSolver (or
+    Board) to fill it in, it is only touched when given, so the search costs nothing extra
+    without it.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor to set up empty stats.
+
+        :return: None
+        """
+
+        self.__nodes_by_depth: t.List[int] = []
+        self.__placements_by_piece: t.List[int] = []
+        self.__fit_tests = 0
+        self.__prunes = 0
+        self.__cache_hits = 0
+        self.__backtracks = 0
+        self.__time = 0.0
+        self.__start = 0.0
+
+    def start(self, piece_count: int) -> None:
+        """
+        Start timing a search. Counts add up over every search the stats are used for.
+
+        :param piece_count: The number of pieces in the search.
+        :return: None
+        """
+
+        self.__start = time()
+        if len(self.__nodes_by_depth) < piece_count:
+            self.__nodes_by_depth.extend([0] * (piece_count - len(self.__nodes_by_depth)))
+            self.__placements_by_piece.extend([0] * (piece_count - len(self.__placements_by_piece)))
+
+    def stop(self) -> None:
+        """
+        Stop timing a search.
+
+        :return: None
+        """
+
+        self.__time += time() - self.__start
+
+    def add_node(self, depth: int) -> None:
+        """
+        Count a node of the search.
+
+        :param depth: The number of pieces placed at the node.
+        :return: None
+        """
+
+        self.__nodes_by_depth[depth] += 1
+
+    def add_fit_test(self) -> None:
+        """
+        Count a placement tested against the covered squares.
+
+        :return: None
+        """
+
+        self.__fit_tests += 1
+
+    def add_placement(self, piece_index: int) -> None:
+        """
+        Count a placement that fit and was tried.
+
+        :param piece_index: The index of the placement's piece in the placement table.
+        :return: None
+        """
+
+        self.__placements_by_piece[piece_index] += 1
+
+    def add_prune(self) -> None:
+        """
+        Count a placement that was pruned.
+
+        :return: None
+        """
+
+        self.__prunes += 1
+
+    def add_backtrack(self) -> None:
+        """
+        Count a node that was searched to the end without a solution.
+
+        :return: None
+        """
+
+        self.__backtracks += 1
+
+    def add_cache_hit(self) -> None:
+        """
+        Count a state that was answered from a cache instead of being searched.
+
+        :return: None
+        """
+
+        self.__cache_hits += 1
+
+    def get_nodes(self) -> int:
+        """
+        Get the number of nodes expanded.
+
+        :return: The number of nodes.
+        """
+
+        return sum(self.__nodes_by_depth)
+
+    def get_nodes_by_depth(self) -> t.List[int]:
+        """
+        Get the number of nodes expanded at each depth.
+
+        :return: A list of node counts, indexed by the number of pieces placed.
+        """
+
+        return list(self.__nodes_by_depth)
+
+    def get_placements_by_piece(self) -> t.List[int]:
+        """
+        Get the number of placements tried of each piece, which fit the covered squares.
+
+        :return: A list of placement counts, indexed by piece index in the placement table.
+        """
+
+        return list(self.__placements_by_piece)
+
+    def get_placements_tried(self) -> int:
+        """
+        Get the number of placements tried, which fit the covered squares.
+
+        :return: The number of placements.
+        """
+
+        return sum(self.__placements_by_piece)
+
+    def get_fit_tests(self) -> int:
+        """
+        Get the number of placements tested against the covered squares.
+
+        :return: The number of fit tests.
+        """
+
+        return self.__fit_tests
+
+    def get_prunes(self) -> int:
+        """
+        Get the number of placements pruned.
+
+        :return: The number of prunes.
+        """
+
+        return self.__prunes
+
+    def get_backtracks(self) -> int:
+        """
+        Get the number of nodes searched to the end without a solution.
+
+        :return: The number of backtracks.
+        """
+
+        return self.__backtracks
+
+    def get_cache_hits(self) -> int:
+        """
+        Get the number of states answered from a cache instead of being searched. These aren't
+        counted as nodes.
+
+        :return: The number of cache hits.
+        """
+
+        return self.__cache_hits
+
+    def get_time(self) -> float:
+        """
+        Get the time spent searching.
+
+        :return: The time in seconds.
+        """
+
+        return self.__time
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """
+        Get the stats as a dictionary, eg to write as JSON.
+
+        :return: The stats.
+        """
+
+        return {
+            'nodes': self.get_nodes(),
+            'nodes_by_depth': self.get_nodes_by_depth(),
+            'placements_by_piece': self.get_placements_by_piece(),
+            'placements_tried': self.get_placements_tried(),
+            'fit_tests': self.__fit_tests,
+            'prunes': self.__prunes,
+            'backtracks': self.__backtracks,
+            'cache_hits': self.__cache_hits,
+            'time': self.__time,
+        }
+
+    def __str__(self) -> str:
+        """
+        Get the stats as text, with a histogram of the nodes at each depth.
+
+        :return: The text.
+        """
+
+        text = (f"Nodes: {self.get_nodes()}, Placements tried: {self.get_placements_tried()}, "
+                f"Fit tests: {self.__fit_tests}, Prunes: {self.__prunes}, "
+                f"Backtracks: {self.__backtracks}, Cache hits: {self.__cache_hits}, "
+                f"Time: {round(self.__time * 1000)}ms\n")
+
+        widest = max(self.__nodes_by_depth, default=0)
+        for depth, nodes in enumerate(self.__nodes_by_depth):
+            histogram = '#' * round(40 * nodes / widest) if widest else ''
+            text += f"Depth {depth}: {nodes:>8} {histogram}\n"
+
+        return text
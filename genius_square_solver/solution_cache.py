@@ -0,0 +1,155 @@
+"""
+This module contains the solution cache, which remembers the boards solved in this process by the
+canonical form of their blockers (see symmetry.py).
+
+A rotated or reflected solution is a solution of the rotated or reflected blockers, so a board
+whose blockers are a symmetry of a board already solved is answered from the cache without
+searching, whether or not the solution database has been built.
+"""
+
+import typing as t
+from collections import OrderedDict
+import numpy as np
+from placements import PlacementTable
+from symmetry import INVERSES, canonicalize, transform_space
+
+# The default number of canonical blocker sets each cache holds.
+DEFAULT_SIZE = 1 << 16
+
+
+class SolutionCache:
+    """
+    This class is a bounded map from canonical blocker sets to their first solution and solution
+    count, either of which may not be known yet. When it is full, the least recently used blocker
+    set is dropped.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_SIZE) -> None:
+        """
+        Constructor to set up the cache.
+
+        :param max_size: The maximum number of canonical blocker sets to hold.
+        :return: None
+        """
+
+        # error checking
+        if max_size < 1:
+            raise ValueError("Max size must be at least 1")
+
+        self.__max_size = max_size
+        # The canonical first solution and the solution count of each canonical blocker mask
+        self.__records: OrderedDict[int, t.List[t.Any]] = OrderedDict()
+
+    def get_solution(self, blockers: t.List[t.Any]) -> t.Optional[np.ndarray]:
+        """
+        Get a solution of a blocker set, from a symmetric blocker set that was solved.
+
+        :param blockers: A list of the blocker positions.
+        :return: The space of the solution, or None if no solution is known.
+        """
+
+        key, transform = canonicalize(blockers)
+        record = self.__get_record(key)
+        if record is None or record[0] is None:
+            return None
+        return transform_space(record[0], INVERSES[transform]).copy()
+
+    def add_solution(self, blockers: t.List[t.Any], space: np.ndarray) -> None:
+        """
+        Remember a solution of a blocker set.
+
+        :param blockers: A list of the blocker positions.
+        :param space: The space of the solution.
+        :return: None
+        """
+
+        key, transform = canonicalize(blockers)
+        self.__set_record(key, 0, transform_space(space, transform).copy())
+
+    def get_count(self, blockers: t.List[t.Any]) -> t.Optional[int]:
+        """
+        Get the solution count of a blocker set, from a symmetric blocker set that was counted.
+
+        :param blockers: A list of the blocker positions.
+        :return: The number of solutions, or None if it is not known.
+        """
+
+        record = self.__get_record(canonicalize(blockers)[0])
+        return None if record is None else record[1]
+
+    def add_count(self, blockers: t.List[t.Any], count: int) -> None:
+        """
+        Remember the solution count of a blocker set.
+
+        :param blockers: A list of the blocker positions.
+        :param count: The number of solutions.
+        :return: None
+        """
+
+        self.__set_record(canonicalize(blockers)[0], 1, count)
+
+    def __get_record(self, key: int) -> t.Optional[t.List[t.Any]]:
+        """
+        Get the record of a canonical blocker mask, marking it as recently used.
+
+        :param key: The canonical blocker mask.
+        :return: The [solution, count] record, or None if there isn't one.
+        """
+
+        record = self.__records.get(key)
+        if record is not None:
+            self.__records.move_to_end(key)
+        return record
+
+    def __set_record(self, key: int, field: int, value: t.Any) -> None:
+        """
+        Set a field of the record of a canonical blocker mask, adding the record if needed.
+
+        :param key: The canonical blocker mask.
+        :param field: 0 for the solution, 1 for the count.
+        :param value: The value to set.
+        :return: None
+        """
+
+        record = self.__get_record(key)
+        if record is None:
+            record = [None, None]
+            self.__records[key] = record
+            if len(self.__records) > self.__max_size:
+                self.__records.popitem(last=False)
+        record[field] = value
+
+    def clear(self) -> None:
+        """
+        Forget every blocker set.
+
+        :return: None
+        """
+
+        self.__records.clear()
+
+    def __len__(self) -> int:
+        """
+        Get the number of canonical blocker sets in the cache.
+
+        :return: The number of blocker sets.
+        """
+
+        return len(self.__records)
+
+
+# The shared cache of each placement table, as solutions depend on the pieces.
+_solution_caches: t.Dict[PlacementTable, SolutionCache] = {}
+
+
+def get_solution_cache(table: PlacementTable) -> SolutionCache:
+    """
+    Get the shared solution cache for a placement table, creating it the first time.
+
+    :param table: The placement table of the pieces the boards are solved with.
+    :return: The cache.
+    """
+
+    if table not in _solution_caches:
+        _solution_caches[table] = SolutionCache()
+    return _solution_caches[table]
@@ -0,0 +1,147 @@
+"""
+This module contains the solution database, which holds a precomputed solution and solution count
+for every blocker set the dice can produce. It is built by build_solution_db.py.
+
+The file is a header followed by fixed-width records sorted by key. Each record holds the 36-bit
+canonical blocker mask (see symmetry.py), the number of solutions, and the first solution of the
+canonical blockers found with the bitboard engine, packed as one 4-bit piece UUID per square. Only
+one of each set of symmetric blocker sets is stored.
+"""
+
+import os
+import struct
+import typing as t
+import numpy as np
+from mapped_file import HEADER, DefaultFile, map_records, write_header
+from symmetry import INVERSES, canonicalize, transform_space
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'res',
+                            'solutions.gsdb')
+
+MAGIC = b'GSDB'
+VERSION = 2
+RECORD = struct.Struct('<QI18s')  # blocker mask, solution count, packed first solution
+KEY = struct.Struct('<Q')  # the blocker mask at the start of a record
+
+
+def pack_space(space: np.ndarray) -> bytes:
+    """
+    Pack a board space into 18 bytes, with one 4-bit piece UUID per square.
+
+    :param space: The 6x6 space of the board.
+    :return: The packed space.
+    """
+
+    cells = space.astype(np.uint8).reshape(-1)
+    return ((cells[0::2] << 4) | cells[1::2]).tobytes()
+
+
+def unpack_space(packed: bytes) -> np.ndarray:
+    """
+    Unpack a board space packed by pack_space.
+
+    :param packed: The packed space.
+    :return: The 6x6 space of the board.
+    """
+
+    pairs = np.frombuffer(packed, np.uint8)
+    cells = np.empty(36, np.int8)
+    cells[0::2] = pairs >> 4
+    cells[1::2] = pairs & 0x0F
+    return cells.reshape((6, 6))
+
+
+def write_database(path: str, records: t.Iterable[tuple[int, int, bytes]]) -> int:
+    """
+    Write a solution database file.
+
+    :param path: The path to write the file to.
+    :param records: The (canonical blocker mask, solution count, packed first solution) records.
+    :return: The number of records written.
+    """
+
+    records = sorted(dict((key, (key, count, packed)) for key, count, packed in records).values())
+    with open(path, 'wb') as file:
+        write_header(file, MAGIC, VERSION, len(records))
+        for record in records:
+            file.write(RECORD.pack(*record))
+    return len(records)
+
+
+class SolutionDatabase:
+    """
+    This class reads a solution database file through a read-only memory map. Records are found
+    by binary search on their key and decoded only when looked up, so opening the database costs
+    nothing, and processes that open the same file share its pages.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Constructor to map the database.
+
+        :param path: The path to the database file.
+        :return: None
+        """
+
+        self.__data, self.__count = map_records(path, MAGIC, VERSION, RECORD.size,
+                                                'solution database')
+
+    def lookup(self, blockers: t.List[t.Any]) -> t.Optional[tuple[int, np.ndarray]]:
+        """
+        Look up a blocker set in the database.
+
+        :param blockers: A list of the blocker positions.
+        :return: The solution count and the space of the first solution, or None if the blocker
+         set is not in the database. The space is all zeros if there are no solutions.
+        """
+
+        key, transform = canonicalize(blockers)
+
+        # binary search for the key, the records are sorted by it
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            (middle_key,) = KEY.unpack_from(self.__data, HEADER.size + middle * RECORD.size)
+            if middle_key < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self.__count:
+            return None
+        found_key, solutions, packed = RECORD.unpack_from(self.__data,
+                                                          HEADER.size + low * RECORD.size)
+        if found_key != key:
+            return None
+        return solutions, transform_space(unpack_space(packed), INVERSES[transform])
+
+    def close(self) -> None:
+        """
+        Unmap the database. It can't be used after this.
+
+        :return: None
+        """
+
+        self.__data.close()
+
+    def __len__(self) -> int:
+        """
+        Get the number of blocker sets in the database.
+
+        :return: The number of blocker sets.
+        """
+
+        return self.__count
+
+
+_default_database = DefaultFile(DEFAULT_PATH, SolutionDatabase)
+
+
+def get_default_database() -> t.Optional[SolutionDatabase]:
+    """
+    Get the database at DEFAULT_PATH, mapping it only the first time it is asked for.
+
+    :return: The database, or None if it has not been built.
+    """
+
+    return _default_database.get()
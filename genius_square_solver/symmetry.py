@@ -0,0 +1,103 @@
+"""
+This module contains the 8 symmetries of the board (rotations and reflections).
+
+Every piece can be flipped and rotated, so rotating or reflecting a solution gives a solution for
+the rotated or reflected blockers. Blocker sets can therefore be mapped to a canonical form, which
+is solved or looked up once for all of its symmetries.
+"""
+
+import typing as t
+import numpy as np
+from bitboard import blockers_to_mask
+from placements import BOARD_SIZE
+
+# Each transform maps a space to its rotated or reflected space.
+TRANSFORMS: t.List[t.Callable[[np.ndarray], np.ndarray]] = [
+    lambda space: space,
+    lambda space: np.rot90(space, 1),
+    lambda space: np.rot90(space, 2),
+    lambda space: np.rot90(space, 3),
+    lambda space: space.T,
+    lambda space: np.rot90(space.T, 1),
+    lambda space: np.rot90(space.T, 2),
+    lambda space: np.rot90(space.T, 3),
+]
+
+# The index of the transform that undoes each transform.
+INVERSES = [0, 3, 2, 1, 4, 5, 6, 7]
+
+
+def _create_destinations() -> t.List[t.List[int]]:
+    """
+    Work out where each transform moves each square to.
+
+    :return: For each transform, a list of the square each square is moved to.
+    """
+
+    destinations = []
+    for transform in TRANSFORMS:
+        sources = transform(np.arange(BOARD_SIZE * BOARD_SIZE).reshape((BOARD_SIZE, BOARD_SIZE)))
+        destination = [0] * (BOARD_SIZE * BOARD_SIZE)
+        for cell, source in enumerate(sources.reshape(-1).tolist()):
+            destination[source] = cell
+        destinations.append(destination)
+    return destinations
+
+
+_destinations = _create_destinations()
+
+
+def transform_mask(mask: int, transform: int) -> int:
+    """
+    Rotate or reflect a board bitmask.
+
+    :param mask: The bitmask to transform.
+    :param transform: The index of the transform in TRANSFORMS.
+    :return: The transformed bitmask.
+    """
+
+    destination = _destinations[transform]
+    new_mask = 0
+    while mask:
+        low_bit = mask & -mask
+        new_mask |= 1 << destination[low_bit.bit_length() - 1]
+        mask ^= low_bit
+    return new_mask
+
+
+def transform_blockers(blockers: t.List[t.Any], transform: int) -> t.List[tuple[int, int]]:
+    """
+    Rotate or reflect a list of blocker positions.
+
+    :param blockers: A list of (row, col) blocker positions.
+    :param transform: The index of the transform in TRANSFORMS.
+    :return: The transformed blocker positions.
+    """
+
+    destination = _destinations[transform]
+    return [divmod(destination[row * BOARD_SIZE + col], BOARD_SIZE) for row, col in blockers]
+
+
+def transform_space(space: np.ndarray, transform: int) -> np.ndarray:
+    """
+    Rotate or reflect a board space.
+
+    :param space: The 6x6 space to transform.
+    :param transform: The index of the transform in TRANSFORMS.
+    :return: The transformed space, as a new array.
+    """
+
+    return np.ascontiguousarray(TRANSFORMS[transform](space))
+
+
+def canonicalize(blockers: t.List[t.Any]) -> tuple[int, int]:
+    """
+    Find the canonical form of a blocker set, which is the smallest bitmask of its 8 symmetries.
+
+    :param blockers: A list of (row, col) blocker positions.
+    :return: The canonical bitmask, and the index of the transform that maps the blockers onto it.
+     A canonical solution is mapped back with transform_space(space, INVERSES[transform]).
+    """
+
+    mask = blockers_to_mask(blockers)
+    return min((transform_mask(mask, transform), transform) for transform in range(len(TRANSFORMS)))
@@ -1,10 +1,22 @@
 """
-This is the code file for the random solver mode for the Genius Square Solver project.
+This is the code file for timing the solver for the Genius Square Solver project.
+
+Run with no arguments to time seeds 0-9999 one at a time. Run with --seeds or --blockers to solve
+a batch of boards across a process pool and write one JSON line per board, eg:
+    python timed.py --seeds 0 279936 --output results.jsonl --processes 64
 """
 
+import argparse
+import json
+import sys
+import typing as t
+from contextlib import nullcontext
+from functools import partial
+from multiprocessing import Pool
 from time import time_ns
 
 from board import Board
+from dice import index_to_letter_coord, letter_coord_to_index
 from dice_combinations import DiceCombo
 
 
@@ -16,8 +28,8 @@ def time(seed: int) -> float:
     :return: The time taken to solve the seed in nanoseconds.
     """
 
-    # create board
-    board = Board(DiceCombo.get_blockers(seed), limit=1, time_limit=600)
+    # create board, without the solution database so the solver itself is timed
+    board = Board(DiceCombo.get_blockers(seed), limit=1, time_limit=600, use_database=False)
 
     # time it in ns
     start_time = time_ns()
@@ -29,13 +41,101 @@ def time(seed: int) -> float:
     return duration
 
 
+def solve_job(job: tuple[t.Optional[int], t.List[t.Any]], use_database: bool = False) -> str:
+    """
+    Solve one board of a batch.
+
+    :param job: The (seed, blockers) to solve. The seed is None if the blockers came from a file.
+    :param use_database: Whether to look the solution up in the solution database. The time is
+     then the time of the lookup rather than of the search.
+    :return: The result as a JSON line, with the seed, blockers, solution and time in seconds.
+     The solution is a list of rows of piece UUIDs, or None if there isn't one.
+    """
+
+    seed, blockers = job
+    board = Board(blockers, limit=1, time_limit=600, use_database=use_database)
+
+    start_time = time_ns()
+    solved = board.solve()
+    end_time = time_ns()
+
+    return json.dumps({
+        'seed': seed,
+        'blockers': [index_to_letter_coord(blocker) for blocker in blockers],
+        'solution': board.get_space().tolist() if solved else None,
+        'time': (end_time - start_time) / 1_000_000_000,
+    })
+
+
+def read_blockers_file(path: str) -> t.Iterator[tuple[t.Optional[int], t.List[t.Any]]]:
+    """
+    Read a file of blocker sets, one per line as letter coordinates eg 'A1,B3,C2,D6,E5,F1,F4'.
+
+    :param path: The path to the file, or '-' for stdin.
+    :return: An iterator of (None, blockers) jobs.
+    """
+
+    # stdin is wrapped so the with block doesn't close it
+    with nullcontext(sys.stdin) if path == '-' else open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield None, [letter_coord_to_index(die) for die in line.split(',')]
+
+
+def batch_solve(jobs: t.Iterable[tuple[t.Optional[int], t.List[t.Any]]], output: t.TextIO,
+                processes: t.Optional[int] = None, chunksize: int = 256,
+                use_database: bool = False) -> int:
+    """
+    Solve a batch of boards across a process pool, writing results in the order of the jobs.
+
+    :param jobs: The (seed, blockers) jobs to solve.
+    :param output: The file to write one JSON line per board to.
+    :param processes: The number of worker processes, or None for one per CPU.
+    :param chunksize: The number of jobs to send to a worker at a time.
+    :param use_database: Whether to look solutions up in the solution database.
+    :return: The number of boards solved.
+    """
+
+    count = 0
+    with Pool(processes) as pool:
+        for line in pool.imap(partial(solve_job, use_database=use_database), jobs,
+                              chunksize=chunksize):
+            output.write(line + '\n')
+            count += 1
+    return count
+
+
 def main() -> None:
     """
-    The main function to run a demo solve of Genius Square.
+    The main function to time solving seeds, or solve a batch of boards.
 
     :return: None
     """
 
+    parser = argparse.ArgumentParser(description="Time the Genius Square solver.")
+    parser.add_argument('--seeds', nargs=2, type=int, metavar=('START', 'STOP'),
+                        help="solve the DiceCombo seeds from START up to STOP")
+    parser.add_argument('--blockers', metavar='FILE',
+                        help="solve the blocker sets in FILE, one per line, or - for stdin")
+    parser.add_argument('--output', default='-', help="the file to write results to")
+    parser.add_argument('--processes', type=int, help="the number of worker processes")
+    parser.add_argument('--chunksize', type=int, default=256,
+                        help="the number of boards to send to a worker at a time")
+    parser.add_argument('--use-database', action='store_true',
+                        help="look solutions up in the solution database instead of searching")
+    args = parser.parse_args()
+
+    if args.seeds is not None or args.blockers is not None:
+        if args.seeds is not None:
+            jobs = ((seed, DiceCombo.get_blockers(seed)) for seed in range(*args.seeds))
+        else:
+            jobs = read_blockers_file(args.blockers)
+
+        with nullcontext(sys.stdout) if args.output == '-' \
+                else open(args.output, 'w', encoding='utf-8') as output:
+            batch_solve(jobs, output, args.processes, args.chunksize, args.use_database)
+        return
+
     count = 0
     _sum = 0
 
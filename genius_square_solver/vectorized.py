@@ -0,0 +1,193 @@
+"""
+This module contains the vectorized solver engine, which solves many boards at once with numpy.
+
+Instead of a Python-level search per board, partial boards from every board in the batch are held
+as rows of numpy arrays, and each step expands all of them at once against the placement table.
+It finds the first solution of each board, searching in the same order as the bitboard engine
+and pruning the same enclosed single squares as its default 'holes' level.
+"""
+
+# pylint: disable=E1133,R0902,R0903,R0914
+
+import typing as t
+from time import time
+import numpy as np
+from bitboard import FULL_BOARD, blockers_to_mask, get_single_pieces
+from placements import BOARD_SIZE, Placement, PlacementTable, cell_bit
+
+# The uint64 masks that stop squares wrapping onto the next row when shifted a column.
+_FIRST_COLUMN = sum(cell_bit(row, 0) for row in range(BOARD_SIZE))
+_NOT_FIRST_COLUMN = np.uint64(FULL_BOARD & ~_FIRST_COLUMN)
+_NOT_LAST_COLUMN = np.uint64(FULL_BOARD & ~(_FIRST_COLUMN << (BOARD_SIZE - 1)))
+
+
+class _Frontier(t.NamedTuple):
+    """
+    A group of partial boards, all with the same number of pieces placed.
+    """
+
+    board: np.ndarray  # (rows,) index of the board in the batch each row belongs to
+    occupied: np.ndarray  # (rows,) uint64 bitmask of covered squares
+    remaining: np.ndarray  # (rows,) uint16 bitmask of the pieces still to place
+    placed: np.ndarray  # (rows, pieces) placement indexes so far, -1 where not placed yet
+
+
+class VectorizedSolver:
+    """
+    This class finds the first solution of a batch of boards with vectorized numpy operations.
+
+    Every board runs its own depth first search, and each step expands the next rows_per_board
+    partial boards of every board at once, so the boards advance in lockstep. The rows of boards
+    that are solved are dropped as the search goes on, and memory stays bounded as only the
+    unexpanded siblings along each board's current path are kept.
+    """
+
+    def __init__(self, table: PlacementTable, rows_per_board: int = 8) -> None:
+        """
+        Constructor to set up the solver and its placement arrays.
+
+        :param table: The placement table of the pieces to place.
+        :param rows_per_board: The most partial boards of each board to expand in one step.
+        :return: None
+        """
+
+        self.__rows_per_board = rows_per_board
+        self.__piece_count = len(table.get_pieces())
+        self.__single_pieces = np.uint16(get_single_pieces(table))
+
+        self.__placements: t.List[Placement] = []
+        for piece_index in range(self.__piece_count):
+            self.__placements.extend(table.get_placements(piece_index))
+        index_of = {placement: index for index, placement in enumerate(self.__placements)}
+
+        self.__bits = np.array([placement.bits for placement in self.__placements], np.uint64)
+        self.__piece_bits = np.array([1 << placement.piece for placement in self.__placements],
+                                     np.uint16)
+
+        # For each square, the indexes, bitmasks and piece bits of the placements that cover it.
+        # The padding covers every square and no piece, so it never fits.
+        covering = [[index_of[placement] for piece_index in range(self.__piece_count)
+                     for placement in table.get_covering(piece_index, cell)]
+                    for cell in range(BOARD_SIZE * BOARD_SIZE)]
+        self.__covering = np.zeros((len(covering), max(map(len, covering))), np.int16)
+        self.__covering_bits = np.full(self.__covering.shape, FULL_BOARD, np.uint64)
+        self.__covering_piece_bits = np.zeros(self.__covering.shape, np.uint16)
+        for cell, indexes in enumerate(covering):
+            self.__covering[cell, :len(indexes)] = indexes
+            self.__covering_bits[cell, :len(indexes)] = self.__bits[indexes]
+            self.__covering_piece_bits[cell, :len(indexes)] = self.__piece_bits[indexes]
+
+    def solve(self, blocker_sets: t.List[t.List[t.Any]],
+              time_limit: float = 600) -> t.List[t.Optional[t.List[Placement]]]:
+        """
+        Find the first solution of each board in a batch.
+
+        :param blocker_sets: A list of the blocker positions of each board.
+        :param time_limit: The maximum number of seconds to search for.
+        :return: The first solution of each board as a list of placements, or None if it has no
+         solution or the time limit was reached first.
+        """
+
+        start_solve = time()
+        solutions: t.List[t.Optional[t.List[Placement]]] = [None] * len(blocker_sets)
+        solved = np.zeros(len(blocker_sets), bool)
+
+        stack = [_Frontier(np.arange(len(blocker_sets)),
+                           np.array([blockers_to_mask(blockers) for blockers in blocker_sets],
+                                    np.uint64),
+                           np.full(len(blocker_sets), (1 << self.__piece_count) - 1, np.uint16),
+                           np.full((len(blocker_sets), self.__piece_count), -1, np.int16))]
+
+        while stack and time() - start_solve <= time_limit:
+            frontier = stack.pop()
+
+            # drop the rows of boards that have been solved since this group was made
+            frontier = self.__compact(frontier, ~solved[frontier.board])
+            if len(frontier.board) == 0:
+                continue
+
+            children = self.__expand(frontier)
+
+            # record the first solution of each board that is now full
+            full = children.occupied == np.uint64(FULL_BOARD)
+            for row in np.flatnonzero(full):
+                board = children.board[row]
+                if not solved[board]:
+                    solved[board] = True
+                    solutions[board] = [self.__placements[index]
+                                        for index in children.placed[row] if index >= 0]
+            children = self.__compact(children, ~full & (children.remaining != 0)
+                                      & ~self.__has_holes(children))
+            if len(children.board) == 0:
+                continue
+
+            # Split the children into groups with at most rows_per_board rows of each board, and
+            # push them in reverse so each board's first children are expanded first.
+            first_of_board = np.r_[True, children.board[1:] != children.board[:-1]]
+            group_start = np.maximum.accumulate(np.where(first_of_board,
+                                                         np.arange(len(first_of_board)), 0))
+            group = (np.arange(len(first_of_board)) - group_start) // self.__rows_per_board
+            order = np.argsort(group, kind='stable')
+            ends = np.cumsum(np.bincount(group))
+            for end, start in reversed(list(zip(ends, np.r_[0, ends[:-1]]))):
+                stack.append(_Frontier(*(array[order[start:end]] for array in children)))
+
+        return solutions
+
+    @staticmethod
+    def __compact(frontier: _Frontier, keep: np.ndarray) -> _Frontier:
+        """
+        Keep only some rows of a frontier.
+
+        :param frontier: The frontier to compact.
+        :param keep: A boolean array of the rows to keep.
+        :return: The compacted frontier.
+        """
+
+        return _Frontier(*(array[keep] for array in frontier))
+
+    def __has_holes(self, frontier: _Frontier) -> np.ndarray:
+        """
+        Find the partial boards with more enclosed single empty squares than remaining single
+        square pieces to fill them, as in the bitboard engine's 'holes' pruning.
+
+        :param frontier: The partial boards to check.
+        :return: A boolean array of the rows that can't be solved.
+        """
+
+        empty = ~frontier.occupied & np.uint64(FULL_BOARD)
+        one, size = np.uint64(1), np.uint64(BOARD_SIZE)
+        neighbours = (((empty << one) & _NOT_FIRST_COLUMN) | ((empty >> one) & _NOT_LAST_COLUMN)
+                      | ((empty << size) & np.uint64(FULL_BOARD)) | (empty >> size))
+        holes = np.bitwise_count(empty & ~neighbours)
+        return holes > np.bitwise_count(frontier.remaining & self.__single_pieces)
+
+    def __expand(self, frontier: _Frontier) -> _Frontier:
+        """
+        Fill the lowest empty square of every row, with every placement of a remaining piece that
+        fits there.
+
+        :param frontier: The partial boards to expand.
+        :return: The new partial boards, grouped by the row they came from.
+        """
+
+        empty = ~frontier.occupied & np.uint64(FULL_BOARD)
+        lowest = empty & (~empty + np.uint64(1))
+        target = np.log2(lowest.astype(np.float64)).astype(np.int64)
+
+        # (rows, covering) bitmasks and piece bits of the placements that cover each target
+        bits = self.__covering_bits[target]
+        piece_bits = self.__covering_piece_bits[target]
+        valid = ((bits & frontier.occupied[:, None]) == 0) & \
+                ((piece_bits & frontier.remaining[:, None]) != 0)
+
+        rows, columns = np.nonzero(valid)
+
+        placed = frontier.placed[rows]
+        depth = self.__piece_count - int(np.count_nonzero(frontier.placed[0] < 0))
+        placed[:, depth] = self.__covering[target[rows], columns]
+
+        return _Frontier(frontier.board[rows],
+                         frontier.occupied[rows] | bits[rows, columns],
+                         frontier.remaining[rows] & ~piece_bits[rows, columns],
+                         placed)